@@ -5,15 +5,30 @@ from PySide6.QtWidgets import (
     QPushButton, QTableWidget, QTableWidgetItem, 
     QProgressBar, QScrollArea, QCheckBox, QGroupBox, QComboBox
 )
-from PySide6.QtCore import QThread, Signal, QUrl, Qt
-from PySide6.QtGui import QDesktopServices
+from PySide6.QtCore import QThread, Signal, QUrl, Qt, QTimer
+from PySide6.QtGui import QDesktopServices, QTextCursor
 import os
+import re
+import time
+import uuid
 
 from core.rag_engine import recommender
-from core.cv_generator import generate_cv
+from core.cv_generator import generate_cv_stream, warmup as warmup_llm
 from core.pdf_writer import generate_resume_pdf_from_text
-from core.storage import save_profile, load_profile, list_profiles,\
-    save_cv_history, load_latest_profile, merge_with_fallback
+from core.storage import BASE_DIR, save_profile_async, load_profile, cached_profile_names,\
+    save_cv_history_async, load_latest_profile, merge_with_fallback, flush_writes
+
+OUTPUT_DIR = BASE_DIR / "generated"
+
+
+def new_pdf_path(profile: dict) -> str:
+    """
+    A fresh file per generated CV, so runs never overwrite each other.
+    """
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    name = re.sub(r"[^\w\-]+", "_", profile.get("full_name") or "resume").strip("_") or "resume"
+    stamp = time.strftime("%Y-%m-%d_%H-%M-%S")
+    return str(OUTPUT_DIR / f"{name}_{stamp}_{uuid.uuid4().hex[:6]}.pdf")
 
 def make_scrollable(widget: QWidget) -> QWidget:
     scroll = QScrollArea()
@@ -21,6 +36,28 @@ def make_scrollable(widget: QWidget) -> QWidget:
     scroll.setWidget(widget)
     return scroll
 
+class WarmupWorker(QThread):
+    """
+    Loads the embedding model and the LLM in the background
+    once the window is already on screen.
+    """
+    status = Signal(str)
+
+    def run(self):
+        steps = [
+            ("embedding model", recommender.warmup),
+            ("CV model", warmup_llm),
+        ]
+        for name, load in steps:
+            self.status.emit(f"Loading {name}…")
+            try:
+                load()
+            except Exception as e:
+                self.status.emit(f"Failed to load {name}: {e}")
+                return
+        self.status.emit("Models ready")
+
+
 class JobWorker(QThread):
     finished = Signal(object)
 
@@ -45,13 +82,31 @@ class JobWorker(QThread):
 
 
 class CVWorker(QThread):
+    """
+    Streams a CV generation and renders the PDF. Cancellation is checked
+    between streamed tokens, so it takes effect once the model has
+    processed the prompt and starts sampling, not during prefill.
+    Any failure is reported through `error`.
+    """
     finished = Signal(str, str, list)
+    token = Signal(str)
+    first_token = Signal(float)
+    cancelled = Signal()
+    error = Signal(str)
 
-    def __init__(self, profile: dict):
+    def __init__(self, profile: dict, regenerate: bool = False):
         super().__init__()
         self.profile = profile
+        self.regenerate = regenerate
 
     def run(self):
+        try:
+            self._run()
+        except Exception as e:
+            print(f"[cv] generation failed: {e}")
+            self.error.emit(str(e))
+
+    def _run(self):
         filled_fields = []
 
         fallback = load_latest_profile()
@@ -62,9 +117,27 @@ class CVWorker(QThread):
                 self.profile, fallback
             )
 
-        raw_text = generate_cv(final_profile)
-
-        output_path = "generated_resume.pdf"
+        start = time.perf_counter()
+        chunks = []
+        self.report = {}
+        stream = generate_cv_stream(
+            final_profile, regenerate=self.regenerate, report=self.report
+        )
+        try:
+            for text in stream:
+                if not chunks:
+                    self.first_token.emit(time.perf_counter() - start)
+                chunks.append(text)
+                self.token.emit(text)
+                if self.isInterruptionRequested():
+                    self.cancelled.emit()
+                    return
+        finally:
+            stream.close()
+
+        raw_text = "".join(chunks).strip()
+
+        output_path = new_pdf_path(final_profile)
         generate_resume_pdf_from_text(raw_text, final_profile, output_path)
 
         self.finished.emit(output_path, raw_text, filled_fields)
@@ -94,7 +167,7 @@ class ProfileTab(QWidget):
         self.has_experience.setChecked(False)
 
         self.profile_selector = QComboBox()
-        self.profile_selector.addItems(list_profiles())
+        self.profile_selector.addItems(cached_profile_names())
 
         self.save_profile_btn = QPushButton("Save Profile")
         self.save_profile_btn.clicked.connect(self.save_current_profile)
@@ -222,9 +295,9 @@ class ProfileTab(QWidget):
 
     def save_current_profile(self):
         name = self.position.text().strip().lower().replace(" ", "_") or "default"
-        save_profile(name, self.get_profile())
+        save_profile_async(name, self.get_profile())
         self.profile_selector.clear()
-        self.profile_selector.addItems(list_profiles())
+        self.profile_selector.addItems(cached_profile_names())
 
 
     def load_selected_profile(self):
@@ -349,10 +422,14 @@ class CVTab(QWidget):
         super().__init__()
         self.profile_tab = profile_tab
         self.pdf_path = None
+        self.worker = None
 
         layout = QVBoxLayout()
 
         self.generate_btn = QPushButton("Generate CV (PDF)")
+        self.cancel_btn = QPushButton("Cancel Generation")
+        self.cancel_btn.setEnabled(False)
+        self.regenerate = QCheckBox("Regenerate (ignore cached result for the same profile)")
         self.status = QLabel("")
         self.status.setWordWrap(True)
 
@@ -384,10 +461,13 @@ class CVTab(QWidget):
         self.folder_btn.setEnabled(False)
 
         self.generate_btn.clicked.connect(self.generate)
+        self.cancel_btn.clicked.connect(self.cancel_generation)
         self.open_btn.clicked.connect(self.open_pdf)
         self.folder_btn.clicked.connect(self.open_folder)
 
+        layout.addWidget(self.regenerate)
         layout.addWidget(self.generate_btn)
+        layout.addWidget(self.cancel_btn)
         layout.addWidget(self.status)
         layout.addWidget(self.path_label)
         layout.addWidget(self.open_btn)
@@ -400,19 +480,62 @@ class CVTab(QWidget):
 
         self.status.setText("Generating CV PDF… please wait")
         self.path_label.setText("")
+        self.raw_preview.clear()
         self.generate_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
         self.open_btn.setEnabled(False)
         self.folder_btn.setEnabled(False)
+        self.recompile_btn.setEnabled(False)
 
-        self.worker = CVWorker(profile)
+        self.worker = CVWorker(profile, regenerate=self.regenerate.isChecked())
+        self.worker.token.connect(self.append_token)
+        self.worker.first_token.connect(self.on_first_token)
+        self.worker.cancelled.connect(self.on_cancelled)
+        self.worker.error.connect(self.on_error)
         self.worker.finished.connect(self.on_result_ready)
         self.worker.start()
 
+    def append_token(self, text: str):
+        self.raw_preview.moveCursor(QTextCursor.End)
+        self.raw_preview.insertPlainText(text)
+
+    def on_first_token(self, seconds: float):
+        self.status.setText(f"Generating CV… (first token after {seconds:.1f}s)")
+
+    def cancel_generation(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.requestInterruption()
+            self.cancel_btn.setEnabled(False)
+            # checked between tokens, so not before the prompt is processed
+            self.status.setText("Cancelling… (stops at the next generated token)")
+
+    def on_cancelled(self):
+        self.status.setText("Generation cancelled. Partial output kept above.")
+        self.generate_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.recompile_btn.setEnabled(bool(self.raw_preview.toPlainText().strip()))
+
+    def on_error(self, message: str):
+        self.status.setText(f"CV generation failed: {message}")
+        self.generate_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.recompile_btn.setEnabled(bool(self.raw_preview.toPlainText().strip()))
+
     def on_result_ready(self, pdf_path: str, raw_text: str, filled_fields: list):
         self.pdf_path = os.path.abspath(pdf_path)
 
         msg = "CV generated successfully"
 
+        report = getattr(self.worker, "report", None) or {}
+        if report.get("cached"):
+            msg += " (cached result — tick 'Regenerate' for a new one)"
+        elif "prompt_tokens" in report:
+            msg += (
+                f"\nPrompt: {report['prompt_tokens']} tokens "
+                f"(examples {', '.join(map(str, report['examples'])) or 'none'}) · "
+                f"Generated: {report.get('completion_tokens', 0)}/{report['max_tokens']} tokens"
+            )
+
         if filled_fields:
             msg += (
                 "\n\n⚠ Some empty fields were auto-filled from your last profile:\n"
@@ -424,11 +547,12 @@ class CVTab(QWidget):
         self.raw_preview.setPlainText(raw_text)
 
         self.generate_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
         self.open_btn.setEnabled(True)
         self.folder_btn.setEnabled(True)
         self.recompile_btn.setEnabled(True)
 
-        save_cv_history(
+        save_cv_history_async(
             profile_name=self.profile_tab.position.text() or "default",
             raw_text=raw_text
         )
@@ -442,16 +566,20 @@ class CVTab(QWidget):
 
         self.status.setText("Recompiling PDF from edited text…")
 
-        output_path = "generated_resume.pdf"
+        profile = self.profile_tab.get_profile()
+        # an edit replaces the CV it was made on
+        output_path = self.pdf_path or new_pdf_path(profile)
 
+        stats = {}
         generate_resume_pdf_from_text(
             edited_text,
-            self.profile_tab.get_profile(),
-            output_path
+            profile,
+            output_path,
+            stats
         )
 
         self.pdf_path = os.path.abspath(output_path)
-        self.status.setText("PDF recompiled successfully")
+        self.status.setText(f"PDF recompiled in {stats['seconds'] * 1000:.0f} ms")
         self.path_label.setText(f"<b>Saved to:</b><br>{self.pdf_path}")
 
         self.open_btn.setEnabled(True)
@@ -486,9 +614,21 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(tabs)
 
+        self.model_status = QLabel("Models not loaded")
+        self.statusBar().addPermanentWidget(self.model_status)
+
+    def start_warmup(self):
+        self.warmup_worker = WarmupWorker()
+        self.warmup_worker.status.connect(self.model_status.setText)
+        self.warmup_worker.start()
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
+    QTimer.singleShot(0, window.start_warmup)
+    code = app.exec()
+    flush_writes(timeout=10)
+    recommender.store.flush()
+    sys.exit(code)
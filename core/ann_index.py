@@ -0,0 +1,196 @@
+import numpy as np
+
+# Below this many vectors a brute-force scan is cheaper than probing lists.
+MIN_TRAIN_SIZE = 2048
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE = 50_000
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class IVFIndex:
+    """
+    Inverted-file index for cosine similarity, in plain NumPy.
+
+    Vectors are clustered with spherical k-means into ~sqrt(n) lists;
+    a query only scores the vectors of the `nprobe` closest lists.
+    Positions returned by `add` are stable until `rebuild()`; removed
+    positions are tombstoned and skipped at query time.
+    """
+
+    def __init__(self, dim: int, nprobe: int | None = None,
+                 min_train_size: int = MIN_TRAIN_SIZE, seed: int = 0):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.rng = np.random.default_rng(seed)
+
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.list_of = np.zeros(0, dtype=np.int64)
+        self.size = 0
+
+        self.centroids = None
+        self.lists = []
+        self._list_arrays = []
+        self._trained_size = 0
+
+    def __len__(self):
+        return int(self.alive[:self.size].sum())
+
+    # ---------- building ----------
+
+    def _grow(self, extra: int):
+        needed = self.size + extra
+        if needed <= len(self.vectors):
+            return
+        capacity = max(needed, 2 * len(self.vectors), 1024)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:self.size] = self.vectors[:self.size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.size] = self.alive[:self.size]
+        list_of = np.full(capacity, -1, dtype=np.int64)
+        list_of[:self.size] = self.list_of[:self.size]
+        self.vectors, self.alive, self.list_of = vectors, alive, list_of
+
+    def add(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = normalize(np.atleast_2d(vectors))
+        n = len(vectors)
+        self._grow(n)
+
+        positions = np.arange(self.size, self.size + n)
+        self.vectors[positions] = vectors
+        self.alive[positions] = True
+        self.size += n
+
+        live = len(self)
+        if self.centroids is None:
+            if live >= self.min_train_size:
+                self.train()
+        elif live > 2 * self._trained_size:
+            self.train()
+        else:
+            self._assign(positions)
+        return positions
+
+    def remove(self, positions):
+        positions = np.asarray(positions, dtype=np.int64)
+        self.alive[positions] = False
+
+    def train(self):
+        """
+        (Re)clusters all live vectors and rebuilds the inverted lists.
+        """
+        live = np.flatnonzero(self.alive[:self.size])
+        n_lists = int(np.clip(np.sqrt(len(live)), 16, 4096))
+        if len(live) < n_lists:
+            self.centroids = None
+            return
+
+        sample = live
+        if len(sample) > KMEANS_SAMPLE:
+            sample = self.rng.choice(live, KMEANS_SAMPLE, replace=False)
+        data = self.vectors[sample]
+
+        centroids = data[self.rng.choice(len(data), n_lists, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, data)
+            empty = np.bincount(assign, minlength=n_lists) == 0
+            sums[empty] = data[self.rng.choice(len(data), int(empty.sum()))]
+            centroids = normalize(sums)
+
+        self.centroids = centroids
+        self.lists = [[] for _ in range(n_lists)]
+        self._list_arrays = [None] * n_lists
+        self._trained_size = len(live)
+        self._assign(live)
+
+    def _assign(self, positions: np.ndarray):
+        if self.centroids is None or not len(positions):
+            return
+        assign = np.argmax(self.vectors[positions] @ self.centroids.T, axis=1)
+        self.list_of[positions] = assign
+        for pos, lst in zip(positions.tolist(), assign.tolist()):
+            self.lists[lst].append(pos)
+            self._list_arrays[lst] = None
+
+    def _list(self, i: int) -> np.ndarray:
+        arr = self._list_arrays[i]
+        if arr is None:
+            arr = np.asarray(self.lists[i], dtype=np.int64)
+            self._list_arrays[i] = arr
+        return arr
+
+    # ---------- querying ----------
+
+    def _probe_count(self) -> int:
+        if self.nprobe:
+            return min(self.nprobe, len(self.lists))
+        return max(4, len(self.lists) // 10)
+
+    def candidates(self, probes: np.ndarray) -> np.ndarray:
+        """
+        Live positions in the union of the given lists.
+        """
+        if self.centroids is None:
+            return np.flatnonzero(self.alive[:self.size])
+        probes = np.unique(probes)
+        cand = np.concatenate([self._list(i) for i in probes])
+        return cand[self.alive[cand]]
+
+    def search(self, query: np.ndarray, k: int):
+        """
+        Returns (positions, cosine scores) of the top-k vectors,
+        best first.
+        """
+        positions, scores = self.search_many(np.atleast_2d(query), k)
+        return positions[0], scores[0]
+
+    def search_many(self, queries: np.ndarray, k: int):
+        """
+        Top-k for a (m, dim) batch of queries with one matmul over the
+        union of their candidates. Returns (m, k') position and score
+        arrays, best first; k' = min(k, number of live vectors).
+        """
+        queries = normalize(np.atleast_2d(queries))
+        m = len(queries)
+
+        if self.centroids is None:
+            cand = self.candidates(None)
+            mask = None
+        else:
+            nprobe = self._probe_count()
+            centroid_scores = queries @ self.centroids.T
+            probes = np.argpartition(-centroid_scores, nprobe - 1, axis=1)[:, :nprobe]
+            cand = self.candidates(probes.ravel())
+
+            probed = np.zeros((m, len(self.lists)), dtype=bool)
+            probed[np.arange(m)[:, None], probes] = True
+            mask = probed[:, self.list_of[cand]]
+
+            # too few candidates for some query: fall back to a full scan
+            if mask.sum(axis=1).min() < k:
+                cand = np.flatnonzero(self.alive[:self.size])
+                mask = None
+
+        k = min(k, len(cand))
+        if not k:
+            return (np.zeros((m, 0), dtype=np.int64),
+                    np.zeros((m, 0), dtype=np.float32))
+
+        scores = queries @ self.vectors[cand].T
+        if mask is not None:
+            scores[~mask] = -np.inf
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return cand[top], np.take_along_axis(top_scores, order, axis=1)
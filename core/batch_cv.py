@@ -0,0 +1,175 @@
+"""
+Headless batch CV generation for stored profiles.
+
+    python -m core.batch_cv --run nightly
+    python -m core.batch_cv --run nightly --names 2025-01-10_14-02_python_developer
+    python -m core.batch_cv --run nightly --bundle zip
+
+Profiles are read from core.storage, generated one after another on the
+single shared Llama instance (with the cached system-prompt prefix) and
+rendered to PDF on a separate thread. Every finished profile is appended
+to `manifest.jsonl` in the run directory, so re-running the same --run
+skips what is already done. With --bundle, all CVs of the run are
+also combined into one `bundle.pdf` (merged, one outline entry per CV)
+or `bundle.zip`.
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+from core.cv_generator import DEFAULT_INSTRUCTIONS, generate_cv, warmup
+from core.pdf_writer import BUNDLE_FORMATS, bundle_pdfs, generate_resume_pdf_from_text
+from core.storage import BASE_DIR, list_profiles, load_profile, save_cv_history
+
+BATCH_DIR = BASE_DIR / "batch"
+
+_DONE = object()
+
+
+def load_manifest(path) -> set:
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line after a crash
+            if record.get("status") == "ok":
+                done.add(record["profile"])
+    return done
+
+
+def append_manifest(path, record: dict):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def run_batch(run_name: str, names: list[str] | None = None,
+              extra_instructions: str = DEFAULT_INSTRUCTIONS,
+              limit: int | None = None, regenerate: bool = False) -> dict:
+    run_dir = BATCH_DIR / run_name
+    run_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = run_dir / "manifest.jsonl"
+
+    done = load_manifest(manifest_path)
+    todo = [n for n in (names or sorted(list_profiles())) if n not in done]
+    if limit is not None:
+        todo = todo[:limit]
+
+    print(f"[batch] {len(done)} already done, {len(todo)} to generate -> {run_dir}")
+    if not todo:
+        return {"generated": 0, "failed": 0}
+
+    warmup()
+
+    render_queue = queue.Queue(maxsize=4)
+    stats = {"generated": 0, "failed": 0}
+    stats_lock = threading.Lock()
+    start = time.perf_counter()
+
+    def report(name: str, ok: bool, gen_seconds: float):
+        with stats_lock:
+            stats["generated" if ok else "failed"] += 1
+            finished = stats["generated"] + stats["failed"]
+            elapsed = time.perf_counter() - start
+        rate = stats["generated"] / elapsed * 3600 if elapsed else 0.0
+        eta = (len(todo) - finished) * elapsed / finished
+        print(f"[batch] {finished}/{len(todo)} {name}: "
+              f"{'ok' if ok else 'FAILED'} in {gen_seconds:.1f}s | "
+              f"{rate:.1f} CVs/hour | ETA {eta / 60:.1f} min")
+
+    def render_worker():
+        while True:
+            item = render_queue.get()
+            if item is _DONE:
+                return
+            name, profile, raw_text, gen_seconds = item
+            record = {"profile": name, "generation_seconds": round(gen_seconds, 2)}
+            try:
+                pdf_path = run_dir / f"{name}.pdf"
+                generate_resume_pdf_from_text(raw_text, profile, str(pdf_path))
+                save_cv_history(profile_name=name, raw_text=raw_text)
+                record.update(status="ok", pdf=str(pdf_path))
+            except Exception as e:
+                record.update(status="error", error=f"render: {e}")
+            append_manifest(manifest_path, record)
+            report(name, record["status"] == "ok", gen_seconds)
+
+    renderer = threading.Thread(target=render_worker, daemon=True)
+    renderer.start()
+
+    try:
+        # the LLM is not thread-safe: all generation stays on this thread
+        for name in todo:
+            t0 = time.perf_counter()
+            try:
+                profile = load_profile(name)
+                raw_text = generate_cv(profile, extra_instructions, regenerate)
+            except Exception as e:
+                gen_seconds = time.perf_counter() - t0
+                append_manifest(manifest_path, {
+                    "profile": name, "status": "error", "error": str(e),
+                    "generation_seconds": round(gen_seconds, 2),
+                })
+                report(name, False, gen_seconds)
+                continue
+            render_queue.put((name, profile, raw_text, time.perf_counter() - t0))
+    finally:
+        render_queue.put(_DONE)
+        renderer.join()
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = round(elapsed, 1)
+    stats["cvs_per_hour"] = round(stats["generated"] / elapsed * 3600, 1) if elapsed else 0.0
+    print(f"[batch] done: {stats}")
+    return stats
+
+
+def bundle_run(run_name: str, fmt: str = "pdf") -> str | None:
+    """
+    Combines every successfully rendered CV of a run into one file.
+    """
+    run_dir = BATCH_DIR / run_name
+    names = sorted(load_manifest(run_dir / "manifest.jsonl"))
+    items = []
+    for name in names:
+        pdf_path = run_dir / f"{name}.pdf"
+        if pdf_path.exists():
+            items.append((name, pdf_path.read_bytes()))
+    if not items:
+        print(f"[batch] nothing to bundle in {run_dir}")
+        return None
+
+    out_path = run_dir / f"bundle.{fmt}"
+    data = bundle_pdfs(items, fmt, str(out_path))
+    print(f"[batch] bundled {len(items)} CVs -> {out_path} ({len(data) / 1024:.0f} KB)")
+    return str(out_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--run", default=time.strftime("%Y-%m-%d"),
+                        help="run name; re-use it to resume")
+    parser.add_argument("--names", nargs="*", help="profile names (default: all)")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--instructions", default=DEFAULT_INSTRUCTIONS)
+    parser.add_argument("--regenerate", action="store_true",
+                        help="ignore cached CV texts for identical profiles")
+    parser.add_argument("--bundle", choices=BUNDLE_FORMATS,
+                        help="also combine the run's CVs into one merged PDF or a zip")
+    args = parser.parse_args()
+
+    run_batch(args.run, args.names, args.instructions, args.limit, args.regenerate)
+    if args.bundle:
+        bundle_run(args.run, args.bundle)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+# Keeps skill tokens like "c#", "c++", ".net", "node.js" in one piece.
+TOKEN_RE = re.compile(r"[.#+]?\w[\w.#+-]*", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t.rstrip(".-").lower() for t in TOKEN_RE.findall(text or "")]
+
+
+class BM25Index:
+    """
+    Incremental Okapi BM25 over an inverted index.
+
+    Document positions are assigned in insertion order and line up
+    with the corpus rows; removed documents are masked out at query time.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self._arrays = {}
+        self.doc_len = np.zeros(0, dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.size = 0
+        self._total_len = 0
+
+    def __len__(self):
+        return int(self.alive[:self.size].sum())
+
+    def add(self, texts: list[str]):
+        n = len(texts)
+        needed = self.size + n
+        if needed > len(self.doc_len):
+            capacity = max(needed, 2 * len(self.doc_len), 1024)
+            doc_len = np.zeros(capacity, dtype=np.float32)
+            doc_len[:self.size] = self.doc_len[:self.size]
+            self.doc_len = doc_len
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:self.size] = self.alive[:self.size]
+            self.alive = alive
+
+        for offset, text in enumerate(texts):
+            pos = self.size + offset
+            tokens = tokenize(text)
+            self.doc_len[pos] = len(tokens)
+            self.alive[pos] = True
+            self._total_len += len(tokens)
+            for term, tf in Counter(tokens).items():
+                self.postings.setdefault(term, ([], []))
+                self.postings[term][0].append(pos)
+                self.postings[term][1].append(tf)
+                self._arrays.pop(term, None)
+        self.size = needed
+
+    def remove(self, positions):
+        positions = np.asarray(positions, dtype=np.int64)
+        live = positions[self.alive[positions]]
+        self._total_len -= int(self.doc_len[live].sum())
+        self.alive[live] = False
+
+    def _posting(self, term: str):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            docs, tfs = self.postings[term]
+            arrays = (np.asarray(docs, dtype=np.int64), np.asarray(tfs, dtype=np.float32))
+            self._arrays[term] = arrays
+        return arrays
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        BM25 score of every document position for `query`.
+        """
+        out = np.zeros(self.size, dtype=np.float32)
+        n_docs = len(self)
+        if not n_docs:
+            return out
+
+        avg_len = max(self._total_len / n_docs, 1.0)
+        norm = self.k1 * (1 - self.b + self.b * self.doc_len[:self.size] / avg_len)
+
+        for term, q_tf in Counter(tokenize(query)).items():
+            if term not in self.postings:
+                continue
+            docs, tfs = self._posting(term)
+            df = len(docs)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            out[docs] += q_tf * idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+
+        out[~self.alive[:self.size]] = 0
+        return out
+
+    def top_n(self, query: str, n: int):
+        """
+        Returns (positions, scores) of the n best matching documents,
+        best first; documents with no matching term are left out.
+        """
+        scores = self.scores(query)
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > n:
+            hits = hits[np.argpartition(-scores[hits], n - 1)[:n]]
+        hits = hits[np.argsort(-scores[hits])]
+        return hits, scores[hits]
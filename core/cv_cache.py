@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+from core.storage import BASE_DIR
+
+CV_CACHE_DIR = BASE_DIR / "cv_cache"
+MAX_ENTRIES = 500
+
+# Bytes hashed from each end of the model file; hashing all of a
+# multi-GB GGUF on every start would cost seconds.
+FINGERPRINT_CHUNK = 8 * 1024 * 1024
+
+_fingerprints = {}
+_fingerprint_lock = threading.Lock()
+
+
+def model_fingerprint(model_path: str) -> str:
+    """
+    Hash of the model file's size plus its first and last 8 MB
+    (header, metadata and tail tensors), memoised per size/mtime.
+    """
+    try:
+        st = os.stat(model_path)
+    except OSError:
+        return f"missing:{model_path}"
+
+    memo_key = (os.path.abspath(model_path), st.st_size, st.st_mtime_ns)
+    with _fingerprint_lock:
+        if memo_key in _fingerprints:
+            return _fingerprints[memo_key]
+
+        h = hashlib.sha256(str(st.st_size).encode("utf-8"))
+        with open(model_path, "rb") as f:
+            h.update(f.read(FINGERPRINT_CHUNK))
+            if st.st_size > 2 * FINGERPRINT_CHUNK:
+                f.seek(-FINGERPRINT_CHUNK, os.SEEK_END)
+                h.update(f.read(FINGERPRINT_CHUNK))
+        _fingerprints[memo_key] = h.hexdigest()
+        return _fingerprints[memo_key]
+
+
+def normalize_details(text: str) -> str:
+    lines = (re.sub(r"\s+", " ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class CVCache:
+    """
+    Content-addressed cache of generated CV texts.
+
+    The key hashes the normalised candidate details, the extra
+    instructions, the sampling parameters and the model id (see
+    `model_fingerprint` for local files), so
+    any change to what the model would see is a miss. Entries are plain
+    text files; the oldest (by last access) are evicted above `max_entries`.
+    """
+
+    def __init__(self, directory=CV_CACHE_DIR, max_entries: int = MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, candidate_details: str, extra_instructions: str,
+            params: dict, model_id: str) -> str:
+        payload = json.dumps({
+            "details": normalize_details(candidate_details),
+            "instructions": normalize_details(extra_instructions),
+            "params": params,
+            "model": model_id,
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str):
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = [
+                e for e in os.scandir(self.directory) if e.name.endswith(".txt")
+            ]
+            if len(entries) <= self.max_entries:
+                return
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            for e in entries[:len(entries) - self.max_entries]:
+                try:
+                    os.remove(e.path)
+                except OSError:
+                    pass
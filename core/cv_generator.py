@@ -1,21 +1,116 @@
-from llama_cpp import Llama
+import os
+
 from core.cv_formatter import build_candidate_details
+from core.kv_cache import PrefixCache
+from core.cv_cache import CVCache
+from core.prompt_budget import PromptBudget
+from core.llm_backend import HTTPBackend, InProcessBackend
 
 MODEL_PATH = "./gemma-3-12b-it-Q4_K_M.gguf"
+N_CTX = int(os.environ.get("CV_LLM_N_CTX", "8192"))
+
+# "inprocess" loads the GGUF here; "http" talks to a shared local
+# OpenAI-compatible server (llama.cpp's llama-server) at CV_LLM_URL.
+LLM_BACKEND = os.environ.get("CV_LLM_BACKEND", "inprocess")
+LLM_URL = os.environ.get("CV_LLM_URL", "http://127.0.0.1:8080")
+LLM_MODEL = os.environ.get("CV_LLM_MODEL") or None
+
+# Speculative decoding: "off", "lookup" (prompt n-gram drafting) or
+# "draft" (small GGUF draft model at CV_DRAFT_MODEL_PATH).
+SPECULATIVE_MODE = os.environ.get("CV_SPECULATIVE", "off")
+DRAFT_MODEL_PATH = os.environ.get("CV_DRAFT_MODEL_PATH", "./gemma-3-1b-it-Q4_K_M.gguf")
+DRAFT_TOKENS = int(os.environ.get("CV_DRAFT_TOKENS", "8"))
 
-llm = Llama(
-    model_path=MODEL_PATH,
-    n_gpu_layers=-1,
-    n_ctx=8192,
-    verbose=False
+# Reuse the evaluated system prompt across generations (RAM + .cv_app/kv_cache).
+USE_PREFIX_CACHE = os.environ.get("CV_PREFIX_CACHE", "1") != "0"
+PREFIX_CACHE_ON_DISK = os.environ.get("CV_PREFIX_CACHE_DISK", "1") != "0"
+PREFIX_CACHE_DISK_MB = int(os.environ.get("CV_PREFIX_CACHE_DISK_MB", "2048"))
+
+prefix_cache = PrefixCache(
+    disk=PREFIX_CACHE_ON_DISK, max_disk_bytes=PREFIX_CACHE_DISK_MB * 1024 ** 2
 )
 
+# Identical requests (same details, instructions, params and model) are
+# answered from .cv_app/cv_cache unless regenerate=True.
+USE_RESULT_CACHE = os.environ.get("CV_RESULT_CACHE", "1") != "0"
+
+result_cache = CVCache()
+
+
+def load_llm(speculative: str = SPECULATIVE_MODE):
+    from llama_cpp import Llama
+    from core.speculative import make_draft_model
+
+    return Llama(
+        model_path=MODEL_PATH,
+        n_gpu_layers=-1,
+        n_ctx=N_CTX,
+        verbose=False,
+        draft_model=make_draft_model(
+            speculative, DRAFT_TOKENS, DRAFT_MODEL_PATH, N_CTX
+        ),
+    )
+
+
+def make_backend(kind: str = LLM_BACKEND):
+    if kind == "http":
+        return HTTPBackend(LLM_URL, model=LLM_MODEL)
+    if kind == "inprocess":
+        return InProcessBackend(
+            load_llm, MODEL_PATH,
+            prefix_cache=prefix_cache if USE_PREFIX_CACHE else None,
+        )
+    raise ValueError(f"Unknown LLM backend {kind!r}, expected 'inprocess' or 'http'")
+
+
+backend = make_backend()
+
+
+def get_llm():
+    """
+    The in-process Llama instance (loaded on first use).
+    """
+    if not isinstance(backend, InProcessBackend):
+        raise RuntimeError(f"No in-process model with the {backend.name!r} LLM backend")
+    return backend.llm
+
+
+def is_loaded() -> bool:
+    return backend.loaded
+
+
+def warmup():
+    backend.warmup()
+
 from core.prompt import system_instruction
 
 
-def generate_cv(profile: dict, extra_instructions: str = "Tone: professional, one-page.") -> str:
+DEFAULT_INSTRUCTIONS = "Tone: professional, one-page."
+
+GENERATION_PARAMS = {
+    "max_tokens": 1200,
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "stop": ["<end_of_turn>"],
+}
+
+# Pick few-shot examples and max_tokens per call so the prompt fits n_ctx.
+USE_PROMPT_BUDGET = os.environ.get("CV_PROMPT_BUDGET", "1") != "0"
+
+prompt_budget = PromptBudget(N_CTX, GENERATION_PARAMS["max_tokens"])
+
+
+def make_prefix(instruction: str) -> str:
+    return f"""<start_of_turn>user
+{instruction}
+
+"""
+
+
+def build_prompt_parts(profile: dict, extra_instructions: str = DEFAULT_INSTRUCTIONS):
     """
-    Uses YOUR original prompt exactly as-is.
+    Uses YOUR original prompt exactly as-is, split into the static
+    prefix (same for every candidate) and the candidate-specific suffix.
     """
 
     candidate_details = build_candidate_details(profile)
@@ -27,21 +122,88 @@ def generate_cv(profile: dict, extra_instructions: str = "Tone: professional, on
 {extra_instructions}
 """
 
-    prompt = f"""<start_of_turn>user
-{system_instruction}
-
-{user_prompt}
+    prefix = make_prefix(system_instruction)
+    suffix = f"""{user_prompt}
 <end_of_turn>
 <start_of_turn>model
 """
+    return prefix, suffix
+
 
-    output = llm(
-        prompt,
-        max_tokens=1200,
-        temperature=0.7,
-        top_p=0.9,
-        stop=["<end_of_turn>"],
-        echo=False
+def build_prompt(profile: dict, extra_instructions: str = DEFAULT_INSTRUCTIONS) -> str:
+    return "".join(build_prompt_parts(profile, extra_instructions))
+
+
+def generate_cv_stream(profile: dict, extra_instructions: str = DEFAULT_INSTRUCTIONS,
+                       regenerate: bool = False, report: dict | None = None):
+    """
+    Yields the CV text chunk by chunk as tokens are sampled.
+    Stopping the iteration (break / close()) stops generation.
+
+    A cached result for the same request is yielded as a single chunk
+    unless `regenerate` is set; only complete generations are cached.
+    If given, `report` is filled with the prompt/generation token split
+    (plus "cached": True on a cache hit).
+    """
+    if report is None:
+        report = {}
+
+    cache_key = None
+    if USE_RESULT_CACHE:
+        cache_key = result_cache.key(
+            build_candidate_details(profile), extra_instructions,
+            GENERATION_PARAMS, backend.model_id(),
+        )
+        if not regenerate:
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                report["cached"] = True
+                yield cached
+                return
+
+    prefix, suffix = build_prompt_parts(profile, extra_instructions)
+    params = dict(GENERATION_PARAMS)
+
+    if USE_PROMPT_BUDGET:
+        plan = prompt_budget.plan(
+            backend, build_candidate_details(profile), suffix, make_prefix
+        )
+        prefix = plan.prefix
+        params["max_tokens"] = plan.max_tokens
+        report.update(plan.report())
+
+    backend.prepare_prefix(prefix)
+
+    chunks = []
+    stream = backend.stream(prefix + suffix, **params)
+    try:
+        for text in stream:
+            chunks.append(text)
+            yield text
+    finally:
+        stream.close()
+
+    output = "".join(chunks)
+    # stream chunks are not tokens (empty ones are dropped, partial UTF-8
+    # and stop-string prefixes are merged), so count the output once
+    report["completion_tokens"] = (
+        len(backend.tokenize(output.encode("utf-8"), add_bos=False)) if output else 0
     )
 
-    return output["choices"][0]["text"].strip()
+    if "prompt_tokens" in report:
+        print(
+            f"[cv_generator] prompt {report['prompt_tokens']} tokens "
+            f"(prefix {report['prefix_tokens']}, suffix {report['suffix_tokens']}, "
+            f"examples {report['examples']}), generated "
+            f"{report.get('completion_tokens', 0)}/{report['max_tokens']}"
+        )
+
+    if cache_key is not None:
+        result_cache.put(cache_key, output)
+
+
+def generate_cv(profile: dict, extra_instructions: str = DEFAULT_INSTRUCTIONS,
+                regenerate: bool = False) -> str:
+    return "".join(
+        generate_cv_stream(profile, extra_instructions, regenerate)
+    ).strip()
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from core.storage import BASE_DIR
+
+EMBEDDINGS_DIR = BASE_DIR / "embeddings"
+
+DEFAULT_MAX_ROWS = 200_000
+# The index is rewritten at once when rows are added or compacted; when
+# only last-used times changed, at most this often (they only steer
+# which rows compaction keeps).
+LAST_USED_SAVE_INTERVAL = 300
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    On-disk embedding cache keyed by the content hash of the encoded text.
+
+    Vectors live in one flat memory-mapped file (`<model>.<dtype>.bin`);
+    `<model>.index.json` maps text hash -> [row, last_used]. New vectors are
+    appended, so existing rows never move until `compact()` rewrites the file
+    keeping only the most recently used rows. The index is read on first
+    use (or load()), not on construction.
+    """
+
+    def __init__(self, model_name: str, directory=EMBEDDINGS_DIR,
+                 dtype: str = "float16", max_rows: int = DEFAULT_MAX_ROWS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dtype = np.dtype(dtype)
+        self.max_rows = max_rows
+
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.data_path = self.directory / f"{slug}.{self.dtype.name}.bin"
+        self.index_path = self.directory / f"{slug}.{self.dtype.name}.index.json"
+
+        self._lock = threading.Lock()
+        self._mmap = None
+        self.dim = None
+        self.rows = 0
+        self.keys = {}
+        self._loaded = False
+        self._last_used_dirty = False
+        self._saved_at = time.monotonic()
+
+    # ---------- persistence ----------
+
+    def load(self):
+        with self._lock:
+            self._ensure_loaded()
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._load_index()
+            self._loaded = True
+
+    def _load_index(self):
+        if not self.index_path.exists() or not self.data_path.exists():
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        self.dim = index.get("dim")
+        self.keys = index.get("keys", {})
+        self.rows = index.get("rows", 0)
+
+        # The data file may be longer than the index if a write was cut
+        # short; rows past `self.rows` are simply overwritten later.
+        if self.dim:
+            on_disk = self.data_path.stat().st_size // (self.dim * self.dtype.itemsize)
+            if on_disk < self.rows:
+                self.keys = {k: v for k, v in self.keys.items() if v[0] < on_disk}
+                self.rows = on_disk
+
+    def _save_index(self):
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "rows": self.rows, "keys": self.keys}, f)
+        os.replace(tmp, self.index_path)
+        self._last_used_dirty = False
+        self._saved_at = time.monotonic()
+
+    def flush(self):
+        """
+        Writes pending last-used updates to the index.
+        """
+        with self._lock:
+            if self._last_used_dirty:
+                self._save_index()
+
+    def _matrix(self):
+        if self._mmap is None and self.rows:
+            self._mmap = np.memmap(
+                self.data_path, dtype=self.dtype, mode="r",
+                shape=(self.rows, self.dim),
+            )
+        return self._mmap
+
+    def _append(self, vectors: np.ndarray):
+        self._mmap = None
+        mode = "r+b" if self.data_path.exists() else "wb"
+        with open(self.data_path, mode) as f:
+            f.seek(self.rows * self.dim * self.dtype.itemsize)
+            f.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+            f.truncate()
+        self.rows += len(vectors)
+
+    # ---------- public API ----------
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self.keys)
+
+    def encode(self, texts: list[str], encode_fn) -> np.ndarray:
+        """
+        Returns float32 embeddings for `texts`, calling
+        `encode_fn(list_of_texts) -> np.ndarray` only for texts
+        that are not in the store yet.
+        """
+        hashes = [text_hash(t) for t in texts]
+
+        with self._lock:
+            self._ensure_loaded()
+            missing = {}
+            for h, t in zip(hashes, texts):
+                if h not in self.keys and h not in missing:
+                    missing[h] = t
+
+            if missing:
+                new_vectors = np.asarray(encode_fn(list(missing.values())))
+                if self.dim is None:
+                    self.dim = int(new_vectors.shape[1])
+                start = self.rows
+                self._append(new_vectors)
+                for i, h in enumerate(missing):
+                    self.keys[h] = [start + i, 0]
+
+            now = int(time.time())
+            for h in hashes:
+                self.keys[h][1] = now
+
+            matrix = self._matrix()
+            rows = np.fromiter((self.keys[h][0] for h in hashes), dtype=np.int64,
+                               count=len(hashes))
+            result = (
+                np.asarray(matrix[rows], dtype=np.float32) if len(rows)
+                else np.zeros((0, self.dim or 0), dtype=np.float32)
+            )
+
+            changed = bool(missing)
+            if self.rows > self.max_rows:
+                self._compact(int(self.max_rows * 0.8), keep=set(hashes))
+                changed = True
+            if hashes:
+                self._last_used_dirty = True
+            if changed or (self._last_used_dirty and
+                           time.monotonic() - self._saved_at >= LAST_USED_SAVE_INTERVAL):
+                self._save_index()
+
+        return result
+
+    def compact(self, max_rows: int | None = None):
+        """
+        Rewrites the data file without orphaned rows, keeping at most
+        `max_rows` of the most recently used vectors.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._compact(self.max_rows if max_rows is None else max_rows)
+            self._save_index()
+
+    def _compact(self, max_rows: int, keep=frozenset()):
+        if not self.rows:
+            return
+
+        by_recency = sorted(
+            self.keys.items(),
+            key=lambda kv: (kv[0] in keep, kv[1][1]),
+            reverse=True,
+        )[:max_rows]
+        by_recency.sort(key=lambda kv: kv[1][0])
+
+        matrix = self._matrix()
+        old_rows = np.array([v[0] for _, v in by_recency], dtype=np.int64)
+        kept = np.asarray(matrix[old_rows]) if len(old_rows) else \
+            np.zeros((0, self.dim), dtype=self.dtype)
+
+        del matrix
+        self._mmap = None
+
+        tmp = self.data_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(np.ascontiguousarray(kept, dtype=self.dtype).tobytes())
+        os.replace(tmp, self.data_path)
+
+        self.keys = {h: [i, v[1]] for i, (h, v) in enumerate(by_recency)}
+        self.rows = len(self.keys)
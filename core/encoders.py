@@ -0,0 +1,135 @@
+import threading
+import time
+
+import numpy as np
+
+EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+ENCODER_BACKENDS = ("torch", "int8", "onnx")
+
+
+class Encoder:
+    """
+    SentenceTransformer behind a selectable CPU backend:
+
+    - "torch": full-precision PyTorch (the original behaviour)
+    - "int8":  PyTorch with dynamic int8 quantization of Linear layers
+    - "onnx":  ONNX Runtime (needs `optimum[onnxruntime]`)
+
+    `name` identifies model + backend, so vectors from different
+    backends are never mixed in the embedding store.
+
+    The model (and torch itself) is only loaded on first use or on an
+    explicit `load()`, so constructing an Encoder is cheap.
+    """
+
+    def __init__(self, model_name: str, backend: str = "torch",
+                 batch_size: int = 32, threads: int | None = None):
+        if backend not in ENCODER_BACKENDS:
+            raise ValueError(
+                f"Unknown encoder backend {backend!r}, expected one of {ENCODER_BACKENDS}"
+            )
+
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        self.threads = threads
+        self.name = model_name if backend == "torch" else f"{model_name}-{backend}"
+
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def model(self):
+        if self._model is None:
+            self.load()
+        return self._model
+
+    def load(self):
+        with self._lock:
+            if self._model is not None:
+                return
+            import torch
+            from sentence_transformers import SentenceTransformer
+
+            if self.threads:
+                torch.set_num_threads(self.threads)
+
+            if self.backend == "onnx":
+                model = self._load_onnx()
+            else:
+                # quantized kernels are CPU-only
+                device = "cpu" if self.backend == "int8" else None
+                model = SentenceTransformer(self.model_name, device=device)
+                if self.backend == "int8":
+                    torch.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                    )
+            self._model = model
+
+    def _load_onnx(self):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "The onnx encoder backend needs `pip install optimum[onnxruntime]`"
+            ) from e
+        from sentence_transformers import SentenceTransformer
+
+        model_kwargs = {"provider": "CPUExecutionProvider"}
+        if self.threads:
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = self.threads
+            model_kwargs["session_options"] = options
+
+        return SentenceTransformer(
+            self.model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs
+        )
+
+    def encode(self, texts, **kwargs):
+        kwargs.setdefault("batch_size", self.batch_size)
+        kwargs.setdefault("convert_to_numpy", True)
+        return self.model.encode(texts, **kwargs)
+
+
+def throughput(encoder: Encoder, texts: list[str], repeat: int = 1) -> float:
+    """
+    Sentences per second for encoding `texts`.
+    """
+    encoder.encode(texts[:encoder.batch_size])  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encoder.encode(texts)
+    return len(texts) * repeat / (time.perf_counter() - start)
+
+
+def ranking_parity(reference: Encoder, candidate: Encoder,
+                   queries: list[str], docs: list[str], k: int = 10) -> dict:
+    """
+    Compares how two encoders rank `docs` for each query.
+
+    Returns the mean top-k overlap, the share of queries whose top-1
+    is unchanged and the mean cosine between both encoders' doc vectors.
+    """
+    def unit(x):
+        x = np.asarray(x, dtype=np.float32)
+        return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+    ref_docs, cand_docs = unit(reference.encode(docs)), unit(candidate.encode(docs))
+    ref_q, cand_q = unit(reference.encode(queries)), unit(candidate.encode(queries))
+
+    k = min(k, len(docs))
+    ref_top = np.argsort(-(ref_q @ ref_docs.T), axis=1)[:, :k]
+    cand_top = np.argsort(-(cand_q @ cand_docs.T), axis=1)[:, :k]
+
+    overlap = np.mean([
+        len(set(r) & set(c)) / k for r, c in zip(ref_top.tolist(), cand_top.tolist())
+    ])
+    return {
+        f"overlap@{k}": float(overlap),
+        "top1_agreement": float(np.mean(ref_top[:, 0] == cand_top[:, 0])),
+        "doc_cosine": float(np.mean(np.sum(ref_docs * cand_docs, axis=1))),
+    }
@@ -0,0 +1,267 @@
+import hashlib
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.ann_index import IVFIndex, normalize
+from core.bm25 import BM25Index
+from core.storage import BASE_DIR
+
+CORPUS_DIR = BASE_DIR / "corpus"
+CORPUS_PATH = CORPUS_DIR / "jobs.pkl"
+
+# Postings not seen in any search for this long are dropped.
+DEFAULT_MAX_AGE_DAYS = 30
+# Tombstoned rows are physically removed once they reach this share.
+COMPACT_DEAD_RATIO = 0.25
+
+# Above this many jobs dense scoring only runs on the BM25 top candidates.
+PREFILTER_MIN_SIZE = 20_000
+PREFILTER_CANDIDATES = 1000
+# Reciprocal rank fusion constant (Cormack et al.)
+RRF_K = 60
+
+JOB_COLUMNS = ["title", "company", "location", "description", "url", "source", "text"]
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+
+class JobCorpus:
+    """
+    Growing local vacancy corpus with an ANN index over its embeddings.
+
+    Jobs are identified by URL (or by text when the URL is missing), so
+    repeated searches refresh `last_seen` instead of adding duplicates;
+    a posting whose text changed is replaced. Rows are append-only and
+    line up with the index positions; removed rows are tombstoned until
+    `compact()`.
+    """
+
+    def __init__(self, path=CORPUS_PATH):
+        self.path = path
+        self.jobs = pd.DataFrame(
+            columns=JOB_COLUMNS + ["job_id", "content_hash", "first_seen", "last_seen", "alive"]
+        )
+        self.index = None
+        self.bm25 = None
+        self._by_id = {}
+        self._columns = {}
+
+    def __len__(self):
+        return int(self.jobs["alive"].sum()) if len(self.jobs) else 0
+
+    @property
+    def embeddings(self) -> np.ndarray | None:
+        if self.index is None:
+            return None
+        return self.index.vectors[:self.index.size]
+
+    # ---------- persistence ----------
+
+    def load(self, encode_fn) -> bool:
+        """
+        Restores the job table from disk; embeddings are re-obtained
+        through `encode_fn(texts)` (normally backed by the embedding store).
+        """
+        if not os.path.exists(self.path):
+            return False
+        try:
+            jobs = pd.read_pickle(self.path)
+        except Exception as e:
+            print("corpus load error:", e)
+            return False
+
+        jobs = jobs[jobs["alive"]].reset_index(drop=True)
+        if jobs.empty:
+            return False
+        self._rebuild(jobs, encode_fn(jobs["text"].tolist()))
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        self.jobs.to_pickle(tmp)
+        os.replace(tmp, self.path)
+
+    def _rebuild(self, jobs: pd.DataFrame, embeddings: np.ndarray):
+        self.jobs = jobs.reset_index(drop=True)
+        self.index = IVFIndex(embeddings.shape[1])
+        self.index.add(embeddings)
+        self.bm25 = BM25Index()
+        self.bm25.add(self.jobs["text"].tolist())
+        self._by_id = dict(zip(self.jobs["job_id"], range(len(self.jobs))))
+        self._columns = {}
+
+    # ---------- updates ----------
+
+    def upsert(self, df: pd.DataFrame, embeddings: np.ndarray) -> int:
+        """
+        Adds new postings and replaces changed ones.
+        Returns the number of rows inserted.
+        """
+        now = time.time()
+        df = df.reset_index(drop=True).copy()
+        df["job_id"] = [
+            _hash(url) if url else _hash(text)
+            for url, text in zip(df["url"].fillna(""), df["text"])
+        ]
+        df["content_hash"] = df["text"].map(_hash)
+
+        # one row per job_id within the batch
+        keep = ~df["job_id"].duplicated(keep="last")
+        df, embeddings = df[keep], embeddings[keep.to_numpy()]
+
+        stale, fresh = [], []
+        for i, (job_id, content_hash) in enumerate(zip(df["job_id"], df["content_hash"])):
+            row = self._by_id.get(job_id)
+            if row is not None and self.jobs.at[row, "content_hash"] == content_hash:
+                self.jobs.at[row, "last_seen"] = now
+                continue
+            if row is not None:
+                stale.append(row)
+            fresh.append(i)
+
+        self._remove_rows(stale)
+        if not fresh:
+            return 0
+
+        new_rows = df.iloc[fresh][JOB_COLUMNS + ["job_id", "content_hash"]].copy()
+        new_rows["first_seen"] = now
+        new_rows["last_seen"] = now
+        new_rows["alive"] = True
+        new_vectors = embeddings[fresh]
+
+        if self.index is None:
+            self._rebuild(new_rows, new_vectors)
+            return len(new_rows)
+
+        start = len(self.jobs)
+        self.index.add(new_vectors)
+        self.bm25.add(new_rows["text"].tolist())
+        self.jobs = pd.concat([self.jobs, new_rows], ignore_index=True)
+        self._columns = {}
+        for offset, job_id in enumerate(new_rows["job_id"]):
+            self._by_id[job_id] = start + offset
+        return len(new_rows)
+
+    def _remove_rows(self, rows):
+        if not rows:
+            return
+        self.jobs.loc[rows, "alive"] = False
+        self.index.remove(rows)
+        self.bm25.remove(rows)
+        for job_id in self.jobs.loc[rows, "job_id"]:
+            self._by_id.pop(job_id, None)
+
+    def expire(self, max_age_days: float = DEFAULT_MAX_AGE_DAYS) -> int:
+        """
+        Drops postings not seen for `max_age_days`. Returns how many.
+        """
+        if not len(self.jobs):
+            return 0
+        cutoff = time.time() - max_age_days * 86400
+        old = self.jobs.index[self.jobs["alive"] & (self.jobs["last_seen"] < cutoff)]
+        self._remove_rows(list(old))
+        self.compact()
+        return len(old)
+
+    def compact(self, force: bool = False):
+        dead = len(self.jobs) - len(self)
+        if not dead or (not force and dead < COMPACT_DEAD_RATIO * len(self.jobs)):
+            return
+        alive = self.jobs["alive"].to_numpy()
+        jobs = self.jobs[alive]
+        if jobs.empty:
+            self.__init__(self.path)
+            return
+        self._rebuild(jobs, self.embeddings[alive])
+
+    # ---------- querying ----------
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Cached NumPy view of a job column, for fancy indexing.
+        """
+        if name not in self._columns:
+            self._columns[name] = self.jobs[name].fillna("").to_numpy(dtype=object)
+        return self._columns[name]
+
+    def search(self, query_embedding: np.ndarray, k: int,
+               query_text: str | None = None, fusion: str = "rrf",
+               alpha: float = 0.5):
+        """
+        Returns (row positions in `jobs`, cosine scores), best first.
+
+        With `query_text` the dense ranking is fused with BM25, either by
+        reciprocal rank ("rrf") or a weighted sum of min-max normalised
+        scores ("weighted", `alpha` = dense weight). The returned scores
+        stay cosine similarities so they can be shown as a match %.
+        """
+        if self.index is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        if not query_text:
+            return self.index.search(query_embedding, k)
+
+        query = normalize(query_embedding).reshape(-1)
+        depth = max(3 * k, 100)
+        sparse_idx, sparse_sc = self.bm25.top_n(query_text, depth)
+
+        if len(self) >= PREFILTER_MIN_SIZE and len(sparse_idx) >= k:
+            # cheap sparse pre-filter: dense only scores the BM25 candidates
+            cand, _ = self.bm25.top_n(query_text, PREFILTER_CANDIDATES)
+            cand_sc = self.index.vectors[cand] @ query
+            order = np.argsort(-cand_sc)[:depth]
+            dense_idx, dense_sc = cand[order], cand_sc[order]
+        else:
+            dense_idx, dense_sc = self.index.search(query, depth)
+
+        if not len(sparse_idx):
+            return dense_idx[:k], dense_sc[:k]
+
+        fused = {}
+        if fusion == "weighted":
+            for idx, sc, weight in ((dense_idx, dense_sc, alpha),
+                                    (sparse_idx, sparse_sc, 1 - alpha)):
+                if not len(sc):
+                    continue
+                span = float(sc.max() - sc.min()) or 1.0
+                for pos, s in zip(idx.tolist(), ((sc - sc.min()) / span).tolist()):
+                    fused[pos] = fused.get(pos, 0.0) + weight * s
+        else:
+            for idx in (dense_idx, sparse_idx):
+                for rank, pos in enumerate(idx.tolist()):
+                    fused[pos] = fused.get(pos, 0.0) + 1.0 / (RRF_K + rank + 1)
+
+        top = sorted(fused, key=fused.get, reverse=True)[:k]
+        top = np.asarray(top, dtype=np.int64)
+        return top, self.index.vectors[top] @ query
+
+    def search_many(self, query_embeddings: np.ndarray, k: int,
+                    query_texts: list[str] | None = None, **fusion_kwargs):
+        if self.index is None:
+            m = len(np.atleast_2d(query_embeddings))
+            return (np.zeros((m, 0), dtype=np.int64),
+                    np.zeros((m, 0), dtype=np.float32))
+        if query_texts:
+            hits = [
+                self.search(q, k, query_text=t, **fusion_kwargs)
+                for q, t in zip(np.atleast_2d(query_embeddings), query_texts)
+            ]
+            return [h[0] for h in hits], [h[1] for h in hits]
+        return self.index.search_many(query_embeddings, k)
+
+    def results(self, indices: np.ndarray, scores: np.ndarray) -> pd.DataFrame:
+        """
+        Builds the ranked result table for one query.
+        """
+        return pd.DataFrame({
+            "title": self.column("title")[indices],
+            "company": self.column("company")[indices],
+            "source": self.column("source")[indices],
+            "url": self.column("url")[indices],
+            "score": np.round((np.asarray(scores, dtype=np.float64) + 1) / 2 * 100, 1),
+        })
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+from core.storage import BASE_DIR
+
+KV_CACHE_DIR = BASE_DIR / "kv_cache"
+
+# States are large (KV for thousands of tokens), so keep only a few in RAM.
+MAX_RAM_STATES = 2
+# Every prefix variant (example subset, n_ctx, model) gets its own file;
+# the least recently used ones are removed above this total size.
+MAX_DISK_BYTES = 2 * 1024 ** 3
+
+
+class PrefixCache:
+    """
+    Saves the evaluated KV state of a static prompt prefix (the system
+    instruction with its few-shot examples) and restores it before each
+    generation, so llama.cpp only has to prefill the candidate-specific
+    suffix.
+
+    States are kept in RAM and, with `disk=True`, pickled under
+    .cv_app/kv_cache so they survive restarts, up to `max_disk_bytes`
+    (oldest by last use evicted). The key covers the model file and the
+    prefix text, so any change to either re-primes.
+    """
+
+    def __init__(self, disk: bool = True, directory=KV_CACHE_DIR,
+                 max_ram_states: int = MAX_RAM_STATES,
+                 max_disk_bytes: int = MAX_DISK_BYTES):
+        self.disk = disk
+        self.directory = directory
+        self.max_ram_states = max_ram_states
+        self.max_disk_bytes = max_disk_bytes
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, llm, prefix: str) -> str:
+        h = hashlib.sha1()
+        h.update(str(getattr(llm, "model_path", "")).encode("utf-8"))
+        h.update(str(llm.n_ctx()).encode("utf-8"))
+        h.update(prefix.encode("utf-8"))
+        return h.hexdigest()
+
+    def _disk_path(self, key: str):
+        return os.path.join(self.directory, f"{key}.state")
+
+    def _load_from_disk(self, key: str):
+        if not self.disk:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+            # mtime is the last use, for eviction
+            os.utime(path)
+            return state
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _save_to_disk(self, key: str, state):
+        if not self.disk:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._disk_path(key)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self._evict(keep=path)
+
+    def _evict(self, keep: str):
+        entries = [e for e in os.scandir(self.directory) if e.name.endswith(".state")]
+        total = sum(e.stat().st_size for e in entries)
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries:
+            if total <= self.max_disk_bytes:
+                break
+            # the state just written stays even if it alone is over the limit
+            if e.path == keep:
+                continue
+            try:
+                total -= e.stat().st_size
+                os.remove(e.path)
+            except OSError:
+                pass
+
+    def _remember(self, key: str, state):
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_ram_states:
+            self._states.popitem(last=False)
+
+    def prefix_tokens(self, llm, prefix: str) -> list[int]:
+        tokens = llm.tokenize(prefix.encode("utf-8"), add_bos=True, special=True)
+        # The last token may merge differently once the suffix follows it.
+        return tokens[:-1]
+
+    def prepare(self, llm, prefix: str) -> int:
+        """
+        Makes sure the model's context starts with the evaluated prefix.
+        Returns the number of prefix tokens that won't be prefilled again.
+        """
+        with self._lock:
+            tokens = self.prefix_tokens(llm, prefix)
+            n = len(tokens)
+
+            # Already in the live context (e.g. the previous generation).
+            if llm.n_tokens >= n and list(llm._input_ids[:n]) == tokens:
+                self.hits += 1
+                return n
+
+            key = self.key(llm, prefix)
+            state = self._states.get(key)
+            if state is None:
+                state = self._load_from_disk(key)
+
+            if state is not None:
+                llm.load_state(state)
+                self._remember(key, state)
+                self.hits += 1
+                return n
+
+            self.misses += 1
+            llm.reset()
+            llm.eval(tokens)
+            state = llm.save_state()
+            self._remember(key, state)
+            self._save_to_disk(key, state)
+            return n
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.endswith(".state"):
+                        os.remove(os.path.join(self.directory, name))
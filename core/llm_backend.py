@@ -0,0 +1,183 @@
+import json
+import threading
+
+import requests
+
+from core.cv_cache import model_fingerprint
+
+
+class LLMBackend:
+    """
+    What the CV generator needs from a model: tokenization (for the
+    prompt budget), a way to warm the static prefix, and streamed
+    completions. `tokenize` mirrors llama_cpp.Llama.tokenize.
+    """
+
+    name = "base"
+
+    def warmup(self):
+        pass
+
+    @property
+    def loaded(self) -> bool:
+        return True
+
+    def model_id(self) -> str:
+        raise NotImplementedError
+
+    def tokenize(self, text: bytes, add_bos: bool = False, special: bool = True) -> list[int]:
+        raise NotImplementedError
+
+    def prepare_prefix(self, prefix: str):
+        pass
+
+    def stream(self, prompt: str, **params):
+        """
+        Yields text chunks; closing the generator stops generation.
+        """
+        raise NotImplementedError
+
+
+class InProcessBackend(LLMBackend):
+    """
+    llama_cpp.Llama inside this process (loaded lazily by `loader`),
+    with the system-prompt KV state restored from `prefix_cache`.
+    """
+
+    name = "inprocess"
+
+    def __init__(self, loader, model_path: str, prefix_cache=None):
+        self.loader = loader
+        self.model_path = model_path
+        self.prefix_cache = prefix_cache
+        self._llm = None
+        self._lock = threading.Lock()
+
+    @property
+    def llm(self):
+        with self._lock:
+            if self._llm is None:
+                self._llm = self.loader()
+            return self._llm
+
+    @property
+    def loaded(self) -> bool:
+        return self._llm is not None
+
+    def warmup(self):
+        self.llm
+
+    def model_id(self) -> str:
+        return model_fingerprint(self.model_path)
+
+    def tokenize(self, text: bytes, add_bos: bool = False, special: bool = True) -> list[int]:
+        return self.llm.tokenize(text, add_bos=add_bos, special=special)
+
+    def prepare_prefix(self, prefix: str):
+        if self.prefix_cache is not None:
+            # llama.cpp then only prefills what follows the cached prefix
+            self.prefix_cache.prepare(self.llm, prefix)
+
+    def stream(self, prompt: str, **params):
+        tracker = getattr(self.llm, "draft_model", None)
+        if hasattr(tracker, "start_sequence"):
+            tracker.start_sequence()
+        stream = self.llm(prompt, echo=False, stream=True, **params)
+        try:
+            for chunk in stream:
+                text = chunk["choices"][0]["text"]
+                if text:
+                    yield text
+        finally:
+            stream.close()
+
+
+class HTTPBackend(LLMBackend):
+    """
+    A shared local OpenAI-compatible completion server, e.g.
+
+        llama-server -m gemma-3-12b-it-Q4_K_M.gguf -c 32768 --parallel 4 --port 8080
+
+    One resident model then serves every app instance and batch job;
+    the server queues requests and batches decoding across slots.
+    `cache_prompt` asks llama.cpp's server to keep the shared prefix in
+    its slot KV cache, which takes the place of the in-process prefix cache.
+    """
+
+    name = "http"
+
+    def __init__(self, base_url: str, model: str | None = None,
+                 timeout=(5, 600)):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._model_id = None
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def warmup(self):
+        self.model_id()
+
+    def model_id(self) -> str:
+        if self._model_id is None:
+            name = self.model
+            try:
+                resp = self.session.get(self._url("/v1/models"), timeout=self.timeout)
+                resp.raise_for_status()
+                models = resp.json().get("data", [])
+                if models and not name:
+                    name = models[0].get("id")
+            except (requests.RequestException, ValueError) as e:
+                raise ConnectionError(f"LLM server at {self.base_url} is not reachable: {e}") from e
+            self._model_id = f"http:{name or 'default'}"
+        return self._model_id
+
+    def tokenize(self, text: bytes, add_bos: bool = False, special: bool = True) -> list[int]:
+        content = text.decode("utf-8")
+        # llama.cpp server, then llama-cpp-python's server
+        attempts = (
+            ("/tokenize", {"content": content, "add_special": add_bos, "parse_special": special}),
+            ("/extras/tokenize", {"input": content}),
+        )
+        for path, payload in attempts:
+            try:
+                resp = self.session.post(self._url(path), json=payload, timeout=self.timeout)
+            except requests.RequestException:
+                continue
+            if resp.ok:
+                return resp.json()["tokens"]
+        raise ConnectionError(f"LLM server at {self.base_url} has no tokenize endpoint")
+
+    def stream(self, prompt: str, **params):
+        payload = {
+            "prompt": prompt,
+            "stream": True,
+            "cache_prompt": True,
+            **params,
+        }
+        if self.model:
+            payload["model"] = self.model
+
+        resp = self.session.post(
+            self._url("/v1/completions"), json=payload,
+            stream=True, timeout=self.timeout,
+        )
+        try:
+            resp.raise_for_status()
+            # llama-server sends text/event-stream without a charset, which
+            # requests would decode as ISO-8859-1
+            resp.encoding = "utf-8"
+            for line in resp.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                text = json.loads(data)["choices"][0].get("text", "")
+                if text:
+                    yield text
+        finally:
+            # dropping the connection makes the server stop generating
+            resp.close()
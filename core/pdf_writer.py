@@ -1,5 +1,13 @@
-import fitz
+import io
+import os
 import re
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from functools import lru_cache
+
+import fitz
 
 PLACEHOLDER_PATTERNS = [
     r"\[optional:.*?\]",
@@ -9,26 +17,53 @@ PLACEHOLDER_PATTERNS = [
     r"\(mention .*?\)",
 ]
 
+
+# Separate patterns each get the regex engine's fast literal-prefix scan;
+# past a handful of patterns one alternation over the text wins.
+COMBINE_PATTERNS_FROM = 8
+
+
+@lru_cache(maxsize=8)
+def _placeholder_regexes(patterns: tuple) -> list:
+    if len(patterns) >= COMBINE_PATTERNS_FROM:
+        return [re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)]
+    return [re.compile(p, re.IGNORECASE) for p in patterns]
+
+
+def register_placeholder_pattern(pattern: str):
+    """
+    Adds a placeholder pattern to strip from LLM output (case-insensitive).
+    """
+    re.compile(pattern)  # fail here rather than on the next render
+    if pattern not in PLACEHOLDER_PATTERNS:
+        PLACEHOLDER_PATTERNS.append(pattern)
+
+
 def remove_placeholders(text: str) -> str:
-    for pat in PLACEHOLDER_PATTERNS:
-        text = re.sub(pat, "", text, flags=re.IGNORECASE)
+    # compiled once per pattern list, so registering a pattern just works
+    for regex in _placeholder_regexes(tuple(PLACEHOLDER_PATTERNS)):
+        text = regex.sub("", text)
     return text
 
 
+PDF_CHAR_REPLACEMENTS = (
+    ("\u2013", "-"),
+    ("\u2014", "-"),
+    ("\u2018", "'"),
+    ("\u2019", "'"),
+    ("\u201c", '"'),
+    ("\u201d", '"'),
+    ("\u2022", "*"),
+)
+
+
 def clean_text_for_pdf(text: str) -> str:
-    replacements = {
-        "\u2013": "-",
-        "\u2014": "-",
-        "\u2018": "'",
-        "\u2019": "'",
-        "\u201c": '"',
-        "\u201d": '"',
-        "\u2022": "*",
-        "**": "",
-    }
-    for k, v in replacements.items():
-        text = text.replace(k, v)
-    return text
+    # all replaced characters are non-ASCII; isascii() is a flag check
+    if not text.isascii():
+        for k, v in PDF_CHAR_REPLACEMENTS:
+            text = text.replace(k, v)
+    return text.replace("**", "")
+
 
 def parse_resume_robust(raw_text: str):
     raw_text = remove_placeholders(raw_text)
@@ -71,46 +106,113 @@ def parse_resume_robust(raw_text: str):
 
     return data
 
-def create_resume_pdf(parsed_data, profile: dict, output_filename="generated_resume.pdf"):
-    doc = fitz.open()
-    page = doc.new_page()
+MARGIN_LEFT = 50
+MARGIN_RIGHT = 50
+MARGIN_TOP = 50
+MARGIN_BOTTOM = 50
+
+FONT_REG = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+
+PAGE_WIDTH, PAGE_HEIGHT = fitz.paper_size("a4")
+
+# drop unused objects, compress streams and embedded fonts, pack the
+# remaining small objects into compressed object streams
+PDF_SAVE_OPTIONS = {"garbage": 3, "deflate": True, "deflate_fonts": True, "use_objstms": 1}
+BUNDLE_FORMATS = ("pdf", "zip")
+
 
-    width, height = page.rect.width, page.rect.height
+LINE_SPACING = 1.3
+BLOCK_GAP = 2
 
-    margin_left = 50
-    margin_right = 50
-    margin_top = 50
-    y = margin_top
 
-    font_reg = "Helvetica"
-    font_bold = "Helvetica-Bold"
+_FONTS = {}
 
-    def check_page_break(extra=40):
-        nonlocal page, y
-        if y + extra > height - 50:
-            page = doc.new_page()
-            y = margin_top
 
-    def write_text(text, size, font, is_bullet=False, indent=0):
-        nonlocal y
-        text = clean_text_for_pdf(text)
-        rect = fitz.Rect(margin_left + indent, y, width - margin_right, height - 50)
-        check_page_break(20)
+def _font(name: str):
+    font = _FONTS.get(name)
+    if font is None:
         try:
-            rc = page.insert_textbox(rect, text, fontsize=size, fontname=font, align=0)
-        except:
-            rc = page.insert_textbox(rect, text, fontsize=size, align=0)
-        line_length = (width - margin_left - margin_right - indent) / (size * 0.5)
-        if len(text) == 0: 
-            lines_count = 1
+            font = fitz.Font(fontname=name)
+        except Exception:
+            font = fitz.Font("helv")
+        _FONTS[name] = font
+    return font
+
+
+@lru_cache(maxsize=65536)
+def text_width(text: str, font: str, size: float) -> float:
+    return _font(font).text_length(text, fontsize=size)
+
+
+def _split_word(word, font, size, max_width):
+    """
+    Hard-breaks a word that is wider than a whole line (long URLs etc.).
+    """
+    parts = []
+    current = ""
+    for ch in word:
+        if current and text_width(current + ch, font, size) > max_width:
+            parts.append(current)
+            current = ch
+        else:
+            current += ch
+    parts.append(current)
+    return parts
+
+
+def wrap_text(text: str, font: str, size: float, max_width: float) -> list[str]:
+    """
+    Greedy line breaking using the font's glyph widths.
+    """
+    space = text_width(" ", font, size)
+    lines = []
+    current = ""
+    current_width = 0.0
+
+    for word in text.split():
+        w = text_width(word, font, size)
+        if w > max_width:
+            pieces = _split_word(word, font, size, max_width)
+            if current:
+                lines.append(current)
+            lines.extend(pieces[:-1])
+            current = pieces[-1]
+            current_width = text_width(current, font, size)
+        elif not current:
+            current, current_width = word, w
+        elif current_width + space + w <= max_width:
+            current += " " + word
+            current_width += space + w
         else:
-            lines_count = (len(text) / line_length) + 1
-        height_inc = lines_count * size * 1.4
-        y += height_inc + 1
+            lines.append(current)
+            current, current_width = word, w
+
+    lines.append(current)
+    return lines
+
 
+def _text_ops(text, size, font, indent=0):
+    """
+    Lays out one text block as ("line", text, size, font, x, height) ops,
+    one per output line.
+    """
+    text = clean_text_for_pdf(text)
+    max_width = PAGE_WIDTH - MARGIN_LEFT - MARGIN_RIGHT - indent
+    height = size * LINE_SPACING
+    ops = [
+        ("line", line, size, font, MARGIN_LEFT + indent, height)
+        for line in wrap_text(text, font, size, max_width)
+    ]
+    ops.append(("space", BLOCK_GAP))
+    return ops
+
+
+def layout_header(profile: dict) -> list:
+    ops = []
     full_name = profile.get("full_name", "")
     if full_name:
-        write_text(full_name, 18, font_bold)
+        ops += _text_ops(full_name, 18, FONT_BOLD)
 
     contact_parts = []
     for key in ["location", "phone", "email", "linkedin", "github"]:
@@ -119,38 +221,255 @@ def create_resume_pdf(parsed_data, profile: dict, output_filename="generated_res
             contact_parts.append(val)
 
     if contact_parts:
-        write_text(" | ".join(contact_parts), 10, font_reg)
+        ops += _text_ops(" | ".join(contact_parts), 10, FONT_REG)
+
+    ops.append(("space", 15))
+    return ops
+
+
+def layout_section(section: str, lines: list[str]) -> list:
+    title = _text_ops(section.upper(), 12, FONT_BOLD)
+    body = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("*") or line.startswith("-"):
+            txt = line.lstrip("*- ").strip()
+            body += _text_ops(f"• {txt}", 10, FONT_REG, indent=12)
+        elif "|" in line:
+            body += _text_ops(line, 10, FONT_BOLD)
+        else:
+            body += _text_ops(line, 10, FONT_REG)
+
+    # keep the title together with the first line of the section
+    keep = sum(op[-1] for op in title if op[0] == "line") + 10
+    if body:
+        keep += body[0][-1]
+
+    return [("break", keep)] + title + [("rule", -3), ("space", 10)] + body + [("space", 10)]
+
+
+class LayoutCache:
+    """
+    LRU of laid-out header/sections keyed by their content, so a
+    recompile after editing one section only lays out that section.
+    Pages are always painted from scratch, which is most of a render.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        ops = self._entries.get(key)
+        if ops is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return ops
+        self.misses += 1
+        ops = build()
+        self._entries[key] = ops
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return ops
+
+
+layout_cache = LayoutCache()
+
+
+# Base-14 fonts are built into every PDF viewer and need no embedding.
+# Lines they can encode (WinAnsi) go straight into the page's content
+# stream; anything else (e.g. Cyrillic) is drawn with the embedded font.
+BASE14_FONTS = {FONT_REG: "helv", FONT_BOLD: "hebo"}
+
+
+def _pdf_string(text: str) -> bytes | None:
+    try:
+        raw = text.encode("cp1252")
+    except UnicodeEncodeError:
+        return None
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _paint(doc, ops_list):
+    """
+    Places laid-out ops on pages. Base-14 text and rules of a page are
+    collected into one content stream; other text goes through one
+    TextWriter per page. Both are written when the page is done.
+    """
+    bottom = PAGE_HEIGHT - MARGIN_BOTTOM
+    page = None
+    writer = None
+    content = []
+    fonts = set()
+    y = MARGIN_TOP
+
+    def finish_page():
+        if content:
+            for name in fonts:
+                page.insert_font(fontname=name)
+            xref = doc.get_new_xref()
+            doc.update_object(xref, "<<>>")
+            doc.update_stream(xref, b"\n".join(content))
+            page.set_contents(xref)
+        if writer is not None:
+            writer.write_text(page)
+
+    def new_page():
+        nonlocal page, writer, y
+        if page is not None:
+            finish_page()
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        writer = None
+        content.clear()
+        fonts.clear()
+        y = MARGIN_TOP
+
+    def check_page_break(extra):
+        if y + extra > bottom and y > MARGIN_TOP:
+            new_page()
+
+    new_page()
+    for ops in ops_list:
+        for op in ops:
+            kind = op[0]
+            if kind == "line":
+                _, text, size, font, x, height = op
+                check_page_break(height)
+                base14 = BASE14_FONTS.get(font)
+                string = _pdf_string(text) if base14 else None
+                if string is not None:
+                    # PDF space has its origin at the bottom left
+                    fonts.add(base14)
+                    content.append(
+                        b"BT /%s %g Tf %g %g Td " % (base14.encode(), size, x, PAGE_HEIGHT - y - size)
+                        + string + b" Tj ET"
+                    )
+                else:
+                    if writer is None:
+                        writer = fitz.TextWriter(page.rect)
+                    writer.append((x, y + size), text, font=_font(font), fontsize=size)
+                y += height
+            elif kind == "rule":
+                rule_y = PAGE_HEIGHT - y - op[1]
+                content.append(
+                    b"%g %g m %g %g l S" % (MARGIN_LEFT, rule_y, PAGE_WIDTH - MARGIN_RIGHT, rule_y)
+                )
+            elif kind == "space":
+                y += op[1]
+            elif kind == "break":
+                check_page_break(op[1])
+    finish_page()
 
-    y += 15
 
+def render_resume_pdf(parsed_data, profile: dict, stats: dict | None = None,
+                      save_options: dict | None = None) -> bytes:
+    """
+    Lays out the header and every section (reusing cached layouts for
+    unchanged ones), paints them onto pages and returns the PDF bytes.
+    If given, `stats` receives render time, layout cache reuse and size.
+    """
+    start = time.perf_counter()
+    hits_before = layout_cache.hits
+
+    header_fields = tuple(
+        profile.get(k) or "" for k in ["full_name", "location", "phone", "email", "linkedin", "github"]
+    )
+    ops_list = [layout_cache.get(("header", header_fields), lambda: layout_header(profile))]
     for section, lines in parsed_data["sections"].items():
-        check_page_break(30)
-
-        write_text(section.upper(), 12, font_bold)
-        page.draw_line(
-            (margin_left, y - 3),
-            (width - margin_right, y - 3),
-        )
-        y += 10
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith("*") or line.startswith("-"):
-                txt = line.lstrip("*- ").strip()
-                write_text(f"• {txt}", 10, font_reg, indent=12)
-            elif "|" in line:
-                write_text(line, 10, font_bold)
-            else:
-                write_text(line, 10, font_reg)
-
-        y += 10
-
-    doc.save(output_filename)
-    print(f"PDF generated: {output_filename}")
-
-
-def generate_resume_pdf_from_text(raw_text: str, profile: dict, output_path: str):
+        key = ("section", section, tuple(lines))
+        ops_list.append(layout_cache.get(key, lambda: layout_section(section, lines)))
+
+    doc = fitz.open()
+    _paint(doc, ops_list)
+    # TextWriter embeds the whole font; keep only the glyphs in use
+    doc.subset_fonts()
+    data = doc.tobytes(**(PDF_SAVE_OPTIONS if save_options is None else save_options))
+
+    if stats is not None:
+        stats.update({
+            "seconds": time.perf_counter() - start,
+            "sections": len(ops_list),
+            "reused": layout_cache.hits - hits_before,
+            "pages": doc.page_count,
+            "bytes": len(data),
+        })
+    doc.close()
+    return data
+
+
+def write_pdf(data: bytes, output_filename):
+    """
+    Writes next to the target and renames, so a reader never sees a
+    half-written file.
+    """
+    tmp = f"{output_filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, output_filename)
+
+
+def create_resume_pdf(parsed_data, profile: dict, output_filename="generated_resume.pdf",
+                      stats: dict | None = None) -> bytes:
+    """
+    Renders the resume and, unless `output_filename` is None, writes it.
+    """
+    data = render_resume_pdf(parsed_data, profile, stats)
+    if output_filename is not None:
+        write_pdf(data, output_filename)
+        print(f"PDF generated: {output_filename}")
+    return data
+
+
+def generate_resume_pdf_from_text(raw_text: str, profile: dict, output_path: str | None = None,
+                                  stats: dict | None = None) -> bytes:
     parsed = parse_resume_robust(raw_text)
-    create_resume_pdf(parsed, profile, output_path)
\ No newline at end of file
+    return create_resume_pdf(parsed, profile, output_path, stats)
+
+
+def _unique_name(name: str, used: set, ext: str) -> str:
+    base = re.sub(r"[^\w\-.]+", "_", name).strip("._") or "resume"
+    candidate = f"{base}{ext}"
+    n = 2
+    while candidate in used:
+        candidate = f"{base}_{n}{ext}"
+        n += 1
+    used.add(candidate)
+    return candidate
+
+
+def bundle_pdfs(items, fmt: str = "pdf", output_filename=None) -> bytes:
+    """
+    Combines rendered CVs, given as (title, pdf_bytes) pairs, into one
+    merged PDF (with an outline entry per CV) or a zip of separate PDFs.
+    """
+    if fmt not in BUNDLE_FORMATS:
+        raise ValueError(f"Unknown bundle format {fmt!r}, expected one of {BUNDLE_FORMATS}")
+
+    if fmt == "zip":
+        buf = io.BytesIO()
+        used = set()
+        # PDFs are already deflated, compressing them again buys nothing
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+            for title, pdf in items:
+                zf.writestr(_unique_name(title, used, ".pdf"), pdf)
+        data = buf.getvalue()
+    else:
+        out = fitz.open()
+        toc = []
+        for title, pdf in items:
+            toc.append([1, title, out.page_count + 1])
+            with fitz.open("pdf", pdf) as src:
+                out.insert_pdf(src)
+        out.set_toc(toc)
+        # garbage=4 also merges identical objects across CVs (font dicts, ToUnicode maps)
+        data = out.tobytes(**{**PDF_SAVE_OPTIONS, "garbage": 4})
+        out.close()
+
+    if output_filename is not None:
+        write_pdf(data, output_filename)
+    return data
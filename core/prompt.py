@@ -1,3 +1,5 @@
+import re
+
 examples = """
 ###EXAMPLE 1:
 
@@ -263,13 +265,26 @@ Slot Machine Games: Designed cohesive themes (symbols, backgrounds, and UI) for
 Portfolio: https://readymag.com/u66498178/portfolio
 """
 
+# Individual few-shot blocks ("###EXAMPLE N: ..."), so a prompt can use a subset.
+EXAMPLES = [
+    block for block in re.split(r"(?=###EXAMPLE \d+:)", examples) if block.strip()
+]
+
 complex_cot = (
     "- Identify key skills from the candidate's past roles.\n"
     "- Match these skills to the job description keywords.\n"
     "- Prioritize experiences that show measurable achievements."
 )
 
-system_instruction = f"""Below is an instruction that describes a task, paired with an input that provides candidate details and a target job.
+def build_system_instruction(example_blocks: list[str] | None = None) -> str:
+    """
+    System instruction with the given few-shot blocks (all by default).
+    """
+    if example_blocks is None:
+        example_blocks = EXAMPLES
+    examples_text = "\n" + "".join(example_blocks)
+
+    return f"""Below is an instruction that describes a task, paired with an input that provides candidate details and a target job.
 Write a professional, ATS-friendly resume tailored to the target role.
 ### Strategy:
 {complex_cot}
@@ -286,4 +301,8 @@ Resume:
 [Use sections: Summary, Experience, Education, Skills, Projects/Certifications]
 
 ### Exapmles:
-{examples}"""
+{examples_text}"""
+
+
+system_instruction = build_system_instruction()
+
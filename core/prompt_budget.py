@@ -0,0 +1,129 @@
+import re
+from dataclasses import dataclass, field
+
+from core.prompt import EXAMPLES, build_system_instruction
+
+# Never plan a generation shorter than this; examples are dropped first.
+MIN_NEW_TOKENS = 600
+# Headroom for tokenization differences at the prefix/suffix boundary.
+SAFETY_TOKENS = 16
+
+_WORD_RE = re.compile(r"\w[\w#+.]*", re.UNICODE)
+
+
+def _words(text: str) -> set[str]:
+    return {w.lower() for w in _WORD_RE.findall(text)}
+
+
+def _example_target(block: str) -> str:
+    """
+    The candidate part of a few-shot block (before its resume).
+    """
+    return block.split("### Additional instructions:", 1)[0]
+
+
+def rank_examples(candidate_details: str, examples: list[str] = EXAMPLES) -> list[int]:
+    """
+    Example indices, most similar to the candidate first (word-set
+    Jaccard on the "Candidate details / Job target" part).
+    """
+    cand = _words(candidate_details)
+
+    def similarity(i: int) -> float:
+        ex = _words(_example_target(examples[i]))
+        union = cand | ex
+        return len(cand & ex) / len(union) if union else 0.0
+
+    return sorted(range(len(examples)), key=lambda i: (-similarity(i), i))
+
+
+@dataclass
+class PromptPlan:
+    prefix: str
+    max_tokens: int
+    prompt_tokens: int
+    prefix_tokens: int
+    suffix_tokens: int
+    examples: list[int] = field(default_factory=list)
+
+    def report(self) -> dict:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "prefix_tokens": self.prefix_tokens,
+            "suffix_tokens": self.suffix_tokens,
+            "max_tokens": self.max_tokens,
+            "examples": [i + 1 for i in self.examples],
+        }
+
+
+class PromptBudget:
+    """
+    Fits the prompt into the model's context window.
+
+    Token counts come from the model tokenizer. Few-shot examples are
+    added most-similar-first while the prompt still leaves room for
+    `min_new_tokens` of output; the chosen ones keep their original order
+    so equal selections give an identical (KV-cacheable) prefix.
+    `max_tokens` is then capped to whatever context is left; if even the
+    prompt without examples leaves less than `min_new_tokens`, plan()
+    raises ValueError.
+    """
+
+    def __init__(self, n_ctx: int, max_new_tokens: int,
+                 min_new_tokens: int = MIN_NEW_TOKENS,
+                 safety_tokens: int = SAFETY_TOKENS):
+        self.n_ctx = n_ctx
+        self.max_new_tokens = max_new_tokens
+        self.min_new_tokens = min(min_new_tokens, max_new_tokens)
+        self.safety_tokens = safety_tokens
+        self._counts = {}
+
+    def count(self, llm, text: str) -> int:
+        if text not in self._counts:
+            self._counts[text] = len(
+                llm.tokenize(text.encode("utf-8"), add_bos=False, special=True)
+            )
+        return self._counts[text]
+
+    def plan(self, llm, candidate_details: str, suffix: str,
+             make_prefix) -> PromptPlan:
+        """
+        `make_prefix(system_instruction)` wraps a system instruction
+        into the full static prompt prefix.
+        """
+        suffix_tokens = self.count(llm, suffix)
+        base_tokens = self.count(llm, make_prefix(build_system_instruction([])))
+        available = (
+            self.n_ctx - self.safety_tokens - self.min_new_tokens
+            - suffix_tokens - base_tokens - 1  # BOS
+        )
+
+        chosen = []
+        for i in rank_examples(candidate_details):
+            cost = self.count(llm, EXAMPLES[i])
+            if cost <= available:
+                chosen.append(i)
+                available -= cost
+        chosen.sort()
+
+        prefix = make_prefix(build_system_instruction([EXAMPLES[i] for i in chosen]))
+        prefix_tokens = self.count(llm, prefix) + 1
+        prompt_tokens = prefix_tokens + suffix_tokens
+        room = self.n_ctx - self.safety_tokens - prompt_tokens
+        # llama.cpp reads max_tokens <= 0 as "no limit"; never hand it that
+        if room < self.min_new_tokens:
+            raise ValueError(
+                f"The prompt takes {prompt_tokens} of {self.n_ctx} context tokens, "
+                f"leaving {max(room, 0)} for the CV (need {self.min_new_tokens}). "
+                f"Shorten the profile or instructions, or raise CV_LLM_N_CTX."
+            )
+        max_tokens = min(self.max_new_tokens, room)
+
+        return PromptPlan(
+            prefix=prefix,
+            max_tokens=max_tokens,
+            prompt_tokens=prompt_tokens,
+            prefix_tokens=prefix_tokens,
+            suffix_tokens=suffix_tokens,
+            examples=chosen,
+        )
@@ -1,20 +1,70 @@
+import os
+import threading
+
 import pandas as pd
-from sentence_transformers import SentenceTransformer, util
-import torch
 
 from fetchers.workua_fetcher import fetch_workua_jobs
 from fetchers.dou_fetcher import fetch_dou_jobs
+from core.embedding_store import EmbeddingStore
+from core.job_corpus import JobCorpus
+from core.encoders import Encoder, EMBEDDING_MODEL
+
+# "torch", "int8" or "onnx", see core/encoders.py
+ENCODER_BACKEND = os.environ.get("CV_ENCODER_BACKEND", "torch")
+ENCODER_BATCH_SIZE = int(os.environ.get("CV_ENCODER_BATCH_SIZE", "32"))
+ENCODER_THREADS = int(os.environ.get("CV_ENCODER_THREADS", "0")) or None
 
 
 class RAGJobRecommender:
-    def __init__(self):
-        self.embedder = SentenceTransformer(
-            "paraphrase-multilingual-MiniLM-L12-v2"
+    """
+    Construction is cheap: the embedding model and the stored corpus are
+    loaded on first ingest/search, or ahead of time with `warmup()`.
+    """
+
+    def __init__(self, backend: str = ENCODER_BACKEND,
+                 batch_size: int = ENCODER_BATCH_SIZE,
+                 threads: int | None = ENCODER_THREADS):
+        self.embedder = Encoder(
+            EMBEDDING_MODEL, backend=backend,
+            batch_size=batch_size, threads=threads,
         )
-        self.jobs_df = None
-        self.embeddings = None
+        self.store = EmbeddingStore(self.embedder.name)
+        self.corpus = JobCorpus()
+        self._corpus_loaded = False
+        self._load_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.embedder.loaded and self._corpus_loaded
+
+    def _ensure_corpus(self):
+        with self._load_lock:
+            if not self._corpus_loaded:
+                self.corpus.load(self._embed)
+                self._corpus_loaded = True
+
+    def warmup(self):
+        self.embedder.load()
+        self.store.load()
+        self._ensure_corpus()
+
+    @property
+    def jobs_df(self):
+        return self.corpus.jobs
+
+    @property
+    def embeddings(self):
+        return self.corpus.embeddings
+
+    def _encode_new(self, texts: list[str]):
+        return self.embedder.encode(texts)
+
+    def _embed(self, texts: list[str]):
+        # only texts that were never encoded before hit the model
+        return self.store.encode(texts, self._encode_new)
 
     def ingest(self, query: str, limit: int = 50):
+        self._ensure_corpus()
         jobs = []
 
         try:
@@ -31,7 +81,7 @@ class RAGJobRecommender:
         df.drop_duplicates(subset=["title", "company"], inplace=True)
 
         if df.empty:
-            return False
+            return len(self.corpus) > 0
 
         df["description"] = df["description"].fillna("")
         df = df[df["description"] != ""]
@@ -42,39 +92,44 @@ class RAGJobRecommender:
             df["description"].astype(str)
         )
 
-        self.jobs_df = df.reset_index(drop=True)
-        self.embeddings = self.embedder.encode(
-            self.jobs_df["text"].tolist(),
-            convert_to_tensor=True
-        )
-        return True
-
-    def search(self, semantic_query: str, top_k: int = 20):
-        if self.embeddings is None:
+        df = df.reset_index(drop=True)
+        if not df.empty:
+            self.corpus.upsert(df, self._embed(df["text"].tolist()))
+        self.corpus.expire()
+        self.corpus.save()
+        return len(self.corpus) > 0
+
+    def search(self, semantic_query: str, top_k: int = 20,
+               hybrid: bool = True, fusion: str = "rrf"):
+        self._ensure_corpus()
+        if not len(self.corpus):
             return pd.DataFrame()
 
-        q_emb = self.embedder.encode(
-            semantic_query, convert_to_tensor=True
-        )
-
-        scores = util.cos_sim(q_emb, self.embeddings)[0]
-        k = min(top_k, len(scores))
-        values, indices = torch.topk(scores, k)
-
-        rows = []
-        for score, idx in zip(values, indices):
-            job = self.jobs_df.iloc[int(idx)]
+        q_emb = self.embedder.encode(semantic_query)
 
-            match_pct = (score.item() + 1) / 2 * 100
-
-            rows.append({
-                "title": job["title"],
-                "company": job.get("company", ""),
-                "source": job.get("source", ""),
-                "url": job.get("url", ""),
-                "score": round(match_pct, 1),
-            })
-
-        return pd.DataFrame(rows)
+        indices, scores = self.corpus.search(
+            q_emb, top_k,
+            query_text=semantic_query if hybrid else None,
+            fusion=fusion,
+        )
+        return self.corpus.results(indices, scores)
+
+    def search_many(self, queries: list[str], top_k: int = 20,
+                    hybrid: bool = False) -> list[pd.DataFrame]:
+        """
+        Ranks several queries at once: one encode call and, for pure
+        dense ranking, one similarity matmul for the whole batch.
+        """
+        self._ensure_corpus()
+        if not len(self.corpus) or not queries:
+            return [pd.DataFrame() for _ in queries]
+
+        q_embs = self.embedder.encode(list(queries))
+        indices, scores = self.corpus.search_many(
+            q_embs, top_k, query_texts=list(queries) if hybrid else None
+        )
+        return [
+            self.corpus.results(idx, sc) for idx, sc in zip(indices, scores)
+        ]
 
-recommender = RAGJobRecommender()
\ No newline at end of file
+recommender = RAGJobRecommender()
@@ -0,0 +1,111 @@
+import threading
+
+import numpy as np
+from llama_cpp.llama_speculative import LlamaDraftModel, LlamaPromptLookupDecoding
+
+SPECULATIVE_MODES = ("off", "lookup", "draft")
+
+
+class GGUFDraftModel(LlamaDraftModel):
+    """
+    Drafts tokens greedily with a small GGUF model that shares the main
+    model's tokenizer (e.g. Gemma 3 1B for Gemma 3 12B).
+    """
+
+    def __init__(self, model_path: str, num_pred_tokens: int = 8, n_ctx: int = 8192):
+        from llama_cpp import Llama
+
+        self.num_pred_tokens = num_pred_tokens
+        self.llm = Llama(
+            model_path=model_path,
+            n_gpu_layers=-1,
+            n_ctx=n_ctx,
+            verbose=False,
+        )
+
+    def __call__(self, input_ids: np.ndarray, /, **kwargs) -> np.ndarray:
+        drafted = []
+        # generate() reuses the draft model's KV for the common prefix
+        gen = self.llm.generate(input_ids.tolist(), temp=0.0, top_k=1, reset=True)
+        try:
+            for token in gen:
+                if token == self.llm.token_eos():
+                    break
+                drafted.append(token)
+                if len(drafted) >= self.num_pred_tokens:
+                    break
+        finally:
+            gen.close()
+        return np.array(drafted, dtype=np.intc)
+
+
+class AcceptanceTracker(LlamaDraftModel):
+    """
+    Wraps a draft model and estimates how many drafted tokens the main
+    model accepted.
+
+    llama.cpp calls the draft model once per verification step with the
+    whole sequence so far, so between two calls the sequence grows by the
+    accepted drafts plus the one token the main model sampled itself.
+    """
+
+    def __init__(self, draft: LlamaDraftModel):
+        self.draft = draft
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.proposed = 0
+        self.accepted = 0
+        self.steps = 0
+        self._last_len = None
+        self._last_proposed = 0
+
+    def start_sequence(self):
+        """
+        Call before each generation. The previous sequence's last drafts
+        were never verified, so they are not counted as proposed, and the
+        next step is not compared against the previous prompt's length.
+        """
+        with self._lock:
+            self.proposed -= self._last_proposed
+            self._last_len = None
+            self._last_proposed = 0
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.proposed if self.proposed else 0.0
+
+    def __call__(self, input_ids: np.ndarray, /, **kwargs) -> np.ndarray:
+        draft = self.draft(input_ids, **kwargs)
+        with self._lock:
+            n = len(input_ids)
+            if self._last_len is not None and n > self._last_len:
+                grown = n - self._last_len
+                self.accepted += min(self._last_proposed, max(0, grown - 1))
+            self._last_len = n
+            self._last_proposed = len(draft)
+            self.proposed += len(draft)
+            self.steps += 1
+        return draft
+
+
+def make_draft_model(mode: str, num_pred_tokens: int = 8,
+                     draft_model_path: str | None = None, n_ctx: int = 8192):
+    """
+    Returns a (tracked) draft model for Llama(draft_model=...), or None.
+
+    "lookup" drafts by n-gram matching against the prompt, which suits
+    resumes since they copy many candidate details; "draft" uses a small
+    GGUF model. Both leave the output distribution unchanged: llama.cpp
+    keeps a drafted token only if it equals what the main model samples.
+    """
+    if mode not in SPECULATIVE_MODES:
+        raise ValueError(f"Unknown speculative mode {mode!r}, expected one of {SPECULATIVE_MODES}")
+    if mode == "off":
+        return None
+    if mode == "lookup":
+        return AcceptanceTracker(LlamaPromptLookupDecoding(num_pred_tokens=num_pred_tokens))
+    if not draft_model_path:
+        raise ValueError("Speculative mode 'draft' needs a draft model path")
+    return AcceptanceTracker(GGUFDraftModel(draft_model_path, num_pred_tokens, n_ctx))
@@ -1,101 +1,146 @@
-import json
-import os
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from core.store import LEGACY_TS_FORMAT, Store
+from core.storage_writer import ProfileIndex, StorageWriter
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 BASE_DIR = PROJECT_ROOT / ".cv_app"
+DB_PATH = BASE_DIR / "store.sqlite3"
+
+# JSON directories used before the SQLite store; imported once, then unused
 PROFILES_DIR = BASE_DIR / "profiles"
 HISTORY_DIR = BASE_DIR / "cv_history"
 
-PROFILES_DIR.mkdir(parents=True, exist_ok=True)
-HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+# newest profile names kept in memory for the UI
+PROFILE_INDEX_SIZE = 200
+
+BASE_DIR.mkdir(parents=True, exist_ok=True)
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> Store:
+    global _store
+    with _store_lock:
+        if _store is None:
+            # every commit is fsynced; the background writer batches them
+            _store = Store(DB_PATH, synchronous="FULL")
+            _store.import_json_dirs(PROFILES_DIR, HISTORY_DIR)
+        return _store
+
+
+def _on_written(op, result):
+    if op[0] != "profile":
+        return
+    if result is None:
+        profile_index.failed(op[1])
+    else:
+        profile_index.written(op[1])
+
+
+profile_index = ProfileIndex(PROFILE_INDEX_SIZE)
+writer = StorageWriter(get_store, on_written=_on_written)
+
+
+def flush_writes(timeout: float | None = None) -> bool:
+    """
+    Waits until all queued background writes are committed.
+    """
+    return writer.flush(timeout)
 
 
 # ---------- PROFILES ----------
 
-def save_profile(name: str, profile: dict):
-    ts = datetime.now().strftime("%Y-%m-%d_%H-%M")
-    path = PROFILES_DIR / f"{ts}_{name}.json"
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(profile, f, indent=2, ensure_ascii=False)
+def _stored_profile_name(name: str) -> str:
+    return f"{datetime.now().strftime(LEGACY_TS_FORMAT)}_{name}"
+
+
+def save_profile(name: str, profile: dict) -> str:
+    stored_name = _stored_profile_name(name)
+    get_store().put_profile(stored_name, profile)
+    profile_index.add(stored_name, profile, pending=False)
+    return stored_name
+
+
+def save_profile_async(name: str, profile: dict) -> str:
+    """
+    Like save_profile, but returns before the write: the profile is
+    visible through the in-memory index at once and committed by the
+    background writer.
+    """
+    stored_name = _stored_profile_name(name)
+    profile_index.add(stored_name, profile)
+    writer.submit("profile", stored_name, profile)
+    return stored_name
 
 
 def load_profile(name: str) -> dict:
-    path = PROFILES_DIR / f"{name}.json"
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    profile = profile_index.pending(name) or get_store().get_profile(name)
+    if profile is None:
+        raise FileNotFoundError(f"No profile named {name!r}")
+    return profile
+
 
+def cached_profile_names() -> list[str]:
+    """
+    Newest profile names from the in-memory index (loaded on first use).
+    """
+    if not profile_index.loaded:
+        profile_index.load(get_store())
+    return profile_index.names()
 
-def list_profiles():
-    return [p.stem for p in PROFILES_DIR.glob("*.json")]
+
+def list_profiles(limit: int | None = None, offset: int = 0) -> list[str]:
+    """
+    Stored profile names, newest first.
+    """
+    return get_store().profile_names(limit, offset)
 
 
 # ---------- CV HISTORY ----------
 
-def save_cv_history(profile_name: str, raw_text: str):
-    ts = datetime.now().strftime("%Y-%m-%d_%H-%M")
-    fname = f"{ts}-{profile_name}.json"
-    path = HISTORY_DIR / fname
+def save_cv_history(profile_name: str, raw_text: str) -> int:
+    return get_store().add_history(profile_name, raw_text)
+
+
+def save_cv_history_async(profile_name: str, raw_text: str, callback=None):
+    """
+    Queues a history entry for the background writer; `callback(id)`
+    runs on the writer thread once it is committed.
+    """
+    writer.submit("history", profile_name, raw_text, callback=callback)
+
 
-    data = {
-        "timestamp": ts,
-        "profile_name": profile_name,
-        "raw_text": raw_text
-    }
+def _history_record(row: dict) -> dict:
+    row["timestamp"] = datetime.fromtimestamp(row["created_at"]).isoformat(timespec="microseconds")
+    return row
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
 
+def list_cv_history(limit: int = 50, before: int | None = None,
+                    profile_name: str | None = None) -> list[dict]:
+    """
+    A page of history entries (id, timestamp, profile_name, text_hash),
+    newest first. Pass the last id of a page as `before` for the next page.
+    Entries with the same text_hash share one stored copy of the text.
+    """
+    return [_history_record(r) for r in get_store().history(limit, before, profile_name)]
 
-def list_cv_history():
-    return sorted(HISTORY_DIR.glob("*.json"), reverse=True)
 
+def load_cv_history(entry_id: int) -> dict:
+    row = get_store().get_history(entry_id)
+    if row is None:
+        raise FileNotFoundError(f"No CV history entry {entry_id}")
+    return _history_record(row)
 
-def load_cv_history(path: str) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
 
 def load_latest_profile() -> dict | None:
-    if not os.path.exists(PROFILES_DIR):
-        return None
-
-    files = [
-        f for f in os.listdir(PROFILES_DIR)
-        if f.endswith(".json")
-    ]
-
-    if not files:
-        return None
-
-    def parse_timestamp(filename: str):
-        """
-        Extracts datetime from:
-        YYYY-MM-DD_HH-MM_<anything>.json
-        """
-        try:
-            ts = filename.split("_", 2)[:2]
-            return datetime.strptime("_".join(ts), "%Y-%m-%d_%H-%M")
-        except Exception:
-            return None
-
-    dated_files = []
-    for f in files:
-        dt = parse_timestamp(f)
-        if dt:
-            dated_files.append((dt, f))
-
-    if not dated_files:
-        return None
-
-    dated_files.sort(key=lambda x: x[0], reverse=True)
-    latest_file = dated_files[0][1]
-
-    latest_path = os.path.join(PROFILES_DIR, latest_file)
-
-    with open(latest_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    if not profile_index.loaded:
+        profile_index.load(get_store())
+    return profile_index.latest()
 
 
 def merge_with_fallback(
@@ -0,0 +1,191 @@
+"""
+Background writes for core.storage.
+
+The GUI thread hands saves to a StorageWriter and returns at once; a
+single thread commits whatever queued up within `batch_window` seconds
+as one SQLite transaction, so a burst of saves costs one commit/fsync.
+ProfileIndex is the in-memory view the UI reads (newest profile names,
+the latest profile, profiles not written yet), so filling widgets
+never waits on the disk.
+"""
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class StorageWriter:
+    def __init__(self, get_store, batch_window: float = 0.05, max_batch: int = 256,
+                 on_written=None):
+        self._get_store = get_store
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.on_written = on_written
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.ops = 0
+        self.errors = 0
+
+    def _ensure_thread(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="storage-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, kind: str, name: str, payload, created_at: float | None = None,
+               callback=None):
+        """
+        Queues one Store.write_batch op. The timestamp is taken now, not
+        when the write lands. `callback(result)` runs on the writer thread.
+        """
+        self._ensure_thread()
+        self._queue.put(((kind, name, payload, created_at or time.time()), callback))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until everything submitted before the call is committed.
+        """
+        if self._thread is None:
+            return True
+        # a writer thread that died is restarted, so the marker is reached
+        self._ensure_thread()
+        done = threading.Event()
+        self._queue.put((None, lambda _: done.set()))
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = None):
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.batch_window
+            # a flush marker commits right away instead of waiting out the window
+            while item[0] is not None and len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch):
+        ops = [op for op, _ in batch if op is not None]
+        results = []
+        if ops:
+            try:
+                results = self._get_store().write_batch(ops)
+                self.batches += 1
+            except Exception as e:
+                # one bad op should not sink the rest of the batch
+                print(f"[storage] batch of {len(ops)} writes failed ({e}), retrying one by one")
+                results = []
+                for op in ops:
+                    try:
+                        results.extend(self._get_store().write_batch([op]))
+                    except Exception as e:
+                        print(f"[storage] write of {op[0]} {op[1]!r} failed: {e}")
+                        self.errors += 1
+                        results.append(None)
+            self.ops += len(ops)
+
+        results = iter(results)
+        for op, callback in batch:
+            result = next(results) if op is not None else None
+            try:
+                if op is not None and self.on_written is not None:
+                    self.on_written(op, result)
+                if callback is not None:
+                    callback(result)
+            except Exception as e:
+                # a failing callback must not take the writer thread down
+                print(f"[storage] write callback failed: {e}")
+
+
+class ProfileIndex:
+    """
+    Newest `limit` profile names and the latest profile, kept in memory.
+    Profiles saved but not yet committed are served from here too.
+    """
+
+    def __init__(self, limit: int = 200):
+        self.limit = limit
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._names = []
+        self._latest = None
+        self._latest_name = None
+        self._pending = {}
+
+    def load(self, store):
+        names = store.profile_names(self.limit)
+        latest = store.latest_profile()
+        with self._lock:
+            # anything added before the load is newer than what is on disk
+            added = [n for n in self._names if n not in names]
+            self._names = (added + names)[:self.limit]
+            if self._latest is None:
+                self._latest = latest
+            self.loaded = True
+
+    def add(self, name: str, profile: dict, pending: bool = True):
+        with self._lock:
+            if name in self._names:
+                self._names.remove(name)
+            self._names.insert(0, name)
+            del self._names[self.limit:]
+            self._latest = profile
+            self._latest_name = name
+            if pending:
+                self._pending[name] = profile
+
+    def written(self, name: str):
+        with self._lock:
+            self._pending.pop(name, None)
+
+    def failed(self, name: str):
+        """
+        Forgets a profile whose write failed: it is neither pending nor
+        listed, since it cannot be loaded. If it was the latest profile,
+        the next load() takes the latest one from the store again.
+        """
+        with self._lock:
+            self._pending.pop(name, None)
+            if name in self._names:
+                self._names.remove(name)
+            if self._latest_name == name:
+                self._latest = None
+                self._latest_name = None
+                self.loaded = False
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return list(self._names)
+
+    def latest(self) -> dict | None:
+        with self._lock:
+            return self._latest
+
+    def pending(self, name: str) -> dict | None:
+        with self._lock:
+            return self._pending.get(name)
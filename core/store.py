@@ -0,0 +1,368 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import zstandard
+    TEXT_CODEC = "zstd"
+except ImportError:
+    zstandard = None
+    TEXT_CODEC = "zlib"
+
+COMPRESSION_LEVEL = 6
+
+# Filenames of the JSON files the store replaces: YYYY-MM-DD_HH-MM<sep><name>.json
+LEGACY_TS_FORMAT = "%Y-%m-%d_%H-%M"
+
+
+def compress_text(text: str) -> tuple[str, bytes]:
+    raw = text.encode("utf-8")
+    if TEXT_CODEC == "zstd":
+        return "zstd", zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(raw)
+    return "zlib", zlib.compress(raw, COMPRESSION_LEVEL)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("CV history was written with zstd; install `zstandard` to read it")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown text codec {codec!r}")
+
+
+def _put_text(conn, raw_text: str) -> str:
+    """
+    Stores a CV text once, compressed, under its SHA-256; returns the hash.
+    """
+    text_hash = hashlib.sha256(raw_text.encode("utf-8")).hexdigest()
+    exists = conn.execute("SELECT 1 FROM cv_texts WHERE hash = ?", (text_hash,)).fetchone()
+    if not exists:
+        codec, data = compress_text(raw_text)
+        conn.execute(
+            "INSERT INTO cv_texts (hash, codec, size, data) VALUES (?, ?, ?, ?)",
+            (text_hash, codec, len(raw_text), data),
+        )
+    return text_hash
+
+
+def _content_addressed_history(conn):
+    """
+    Schema version 2: history rows point at deduplicated, compressed
+    texts instead of each carrying its own copy.
+    """
+    conn.execute("""
+        CREATE TABLE cv_texts (
+            hash TEXT PRIMARY KEY,
+            codec TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            data BLOB NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE cv_history_v2 (
+            id INTEGER PRIMARY KEY,
+            created_at REAL NOT NULL,
+            profile_name TEXT NOT NULL,
+            text_hash TEXT NOT NULL REFERENCES cv_texts(hash)
+        )
+    """)
+    rows = conn.execute("SELECT id, created_at, profile_name, raw_text FROM cv_history")
+    for entry_id, created_at, profile_name, raw_text in rows.fetchall():
+        conn.execute(
+            "INSERT INTO cv_history_v2 (id, created_at, profile_name, text_hash) VALUES (?, ?, ?, ?)",
+            (entry_id, created_at, profile_name, _put_text(conn, raw_text)),
+        )
+    conn.execute("DROP TABLE cv_history")
+    conn.execute("ALTER TABLE cv_history_v2 RENAME TO cv_history")
+    conn.execute("CREATE INDEX cv_history_profile ON cv_history(profile_name, id)")
+
+
+SCHEMA = [
+    # version 1
+    """
+    CREATE TABLE profiles (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        created_at REAL NOT NULL,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX profiles_created_at ON profiles(created_at);
+
+    CREATE TABLE cv_history (
+        id INTEGER PRIMARY KEY,
+        created_at REAL NOT NULL,
+        profile_name TEXT NOT NULL,
+        raw_text TEXT NOT NULL
+    );
+    CREATE INDEX cv_history_profile ON cv_history(profile_name, id);
+
+    CREATE TABLE meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    """,
+    _content_addressed_history,
+]
+
+
+def _legacy_timestamp(text: str) -> float | None:
+    try:
+        return datetime.strptime(text[:16], LEGACY_TS_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+class Store:
+    """
+    SQLite store for profiles and CV history.
+
+    Every lookup the app does is an index probe: the latest profile via
+    profiles(created_at), a profile by name via its UNIQUE index, and
+    history pages by id (keyset pagination, newest first). The schema
+    is versioned with PRAGMA user_version; `SCHEMA[i]` (SQL or a
+    function of the connection) upgrades to version i+1.
+
+    CV texts are content-addressed: each distinct text is stored once,
+    compressed (zstd, or zlib without `zstandard`), and history rows
+    only hold its hash.
+    """
+
+    def __init__(self, path, synchronous: str = "NORMAL"):
+        self.path = str(path)
+        self._lock = threading.RLock()
+        # autocommit; multi-statement writes go through _transaction()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL: WAL commits are fsynced at checkpoints; FULL: on every commit
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._upgrade()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _upgrade(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        for target in range(version, len(SCHEMA)):
+            step = SCHEMA[target]
+            with self._transaction() as conn:
+                if callable(step):
+                    step(conn)
+                else:
+                    for statement in step.split(";"):
+                        if statement.strip():
+                            conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {target + 1}")
+        if 0 < version < len(SCHEMA):
+            self._conn.execute("VACUUM")  # give back the space of rewritten tables
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------- profiles ----------
+
+    def put_profile(self, name: str, profile: dict, created_at: float | None = None):
+        """
+        Inserts or replaces the profile stored under `name`.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles (name, created_at, data) VALUES (?, ?, ?)",
+                (name, created_at or time.time(), json.dumps(profile, ensure_ascii=False)),
+            )
+
+    def get_profile(self, name: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM profiles WHERE name = ?", (name,)
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def latest_profile(self) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM profiles ORDER BY created_at DESC LIMIT 1"
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def profile_names(self, limit: int | None = None, offset: int = 0) -> list[str]:
+        """
+        Profile names, newest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM profiles ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            ).fetchall()
+        return [r["name"] for r in rows]
+
+    # ---------- CV history ----------
+
+    def add_history(self, profile_name: str, raw_text: str,
+                    created_at: float | None = None) -> int:
+        with self._transaction() as conn:
+            text_hash = _put_text(conn, raw_text)
+            cur = conn.execute(
+                "INSERT INTO cv_history (created_at, profile_name, text_hash) VALUES (?, ?, ?)",
+                (created_at or time.time(), profile_name, text_hash),
+            )
+            return cur.lastrowid
+
+    def history(self, limit: int = 50, before: int | None = None,
+                profile_name: str | None = None) -> list[dict]:
+        """
+        One page of history entries (without the text), newest first.
+        Pass the last id of a page as `before` to get the next one.
+        """
+        where, args = [], []
+        if before is not None:
+            where.append("id < ?")
+            args.append(before)
+        if profile_name is not None:
+            where.append("profile_name = ?")
+            args.append(profile_name)
+        sql = "SELECT id, created_at, profile_name, text_hash FROM cv_history"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, (*args, limit)).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_history(self, entry_id: int) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT h.id, h.created_at, h.profile_name, h.text_hash, t.codec, t.data "
+                "FROM cv_history h JOIN cv_texts t ON t.hash = h.text_hash WHERE h.id = ?",
+                (entry_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["raw_text"] = decompress_text(entry.pop("codec"), entry.pop("data"))
+        return entry
+
+    def write_batch(self, ops) -> list:
+        """
+        Applies ("profile", name, profile, created_at) and
+        ("history", profile_name, raw_text, created_at) ops in a single
+        transaction, i.e. one commit (and one fsync) for the whole batch.
+        Returns the stored name / history id per op.
+        """
+        results = []
+        with self._transaction() as conn:
+            for kind, name, payload, created_at in ops:
+                if kind == "profile":
+                    conn.execute(
+                        "INSERT OR REPLACE INTO profiles (name, created_at, data) VALUES (?, ?, ?)",
+                        (name, created_at, json.dumps(payload, ensure_ascii=False)),
+                    )
+                    results.append(name)
+                elif kind == "history":
+                    cur = conn.execute(
+                        "INSERT INTO cv_history (created_at, profile_name, text_hash) VALUES (?, ?, ?)",
+                        (created_at, name, _put_text(conn, payload)),
+                    )
+                    results.append(cur.lastrowid)
+                else:
+                    raise ValueError(f"Unknown write op {kind!r}")
+        return results
+
+    def counts(self) -> dict:
+        with self._lock:
+            counts = {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("profiles", "cv_history", "cv_texts")
+            }
+            text_bytes, stored_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM cv_texts"
+            ).fetchone()
+        counts.update(text_bytes=text_bytes, stored_bytes=stored_bytes)
+        return counts
+
+    # ---------- migration ----------
+
+    def import_json_dirs(self, profiles_dir, history_dir) -> dict | None:
+        """
+        One-shot import of the JSON files the app used to write. Runs in
+        a single transaction and is recorded in `meta`, so it never runs
+        twice; the files are left in place.
+        """
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'json_imported'"
+            ).fetchone()
+        if done:
+            return None
+
+        profiles = []
+        for path in _json_files(profiles_dir):
+            data = _read_json(path)
+            if data is None:
+                continue
+            stem = os.path.basename(path)[:-5]
+            created = _legacy_timestamp(stem) or os.path.getmtime(path)
+            profiles.append((stem, created, json.dumps(data, ensure_ascii=False)))
+
+        history = []
+        for path in _json_files(history_dir):
+            data = _read_json(path)
+            if not isinstance(data, dict) or "raw_text" not in data:
+                continue
+            created = _legacy_timestamp(data.get("timestamp", "")) or os.path.getmtime(path)
+            history.append((created, data.get("profile_name", ""), data["raw_text"]))
+
+        profiles.sort(key=lambda r: r[1])
+        history.sort(key=lambda r: r[0])  # ids follow time order
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO profiles (name, created_at, data) VALUES (?, ?, ?)",
+                profiles,
+            )
+            conn.executemany(
+                "INSERT INTO cv_history (created_at, profile_name, text_hash) VALUES (?, ?, ?)",
+                [(created, name, _put_text(conn, text)) for created, name, text in history],
+            )
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('json_imported', ?)",
+                (datetime.now().isoformat(),),
+            )
+
+        result = {"profiles": len(profiles), "history": len(history)}
+        if profiles or history:
+            print(f"[storage] imported {result} from JSON files into {self.path}")
+        return result
+
+
+def _json_files(directory) -> list[str]:
+    if not os.path.isdir(directory):
+        return []
+    return [
+        os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".json")
+    ]
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[storage] skipping {path}: {e}")
+        return None
@@ -0,0 +1,72 @@
+"""
+Encoder backend benchmark: throughput (sentences/sec) and ranking
+parity against the full-precision PyTorch model.
+
+    python -m experiments.bench_encoders --backends torch int8 onnx \
+        --batch-sizes 16 32 64 --threads 4
+"""
+import argparse
+import random
+
+from core.encoders import (
+    EMBEDDING_MODEL, ENCODER_BACKENDS, Encoder, ranking_parity, throughput
+)
+
+SKILLS = [
+    "Python", "Django", "FastAPI", "Kubernetes", "Docker", "Solidity", "C#",
+    ".NET", "React", "Node.js", "PostgreSQL", "MongoDB", "AWS", "Terraform",
+    "Go", "Rust", "Java", "Spring", "Kotlin", "Swift", "PyTorch", "SQL",
+]
+ROLES = [
+    "Backend Developer", "Frontend Engineer", "Data Scientist", "DevOps Engineer",
+    "QA Automation Engineer", "Blockchain Developer", "Tech Lead", "ML Engineer",
+    "Розробник Python", "Інженер DevOps",
+]
+
+
+def synthetic_jobs(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        role = rng.choice(ROLES)
+        skills = ", ".join(rng.sample(SKILLS, 5))
+        jobs.append(
+            f"Title: {role}\nCompany: Company {i}\n"
+            f"We are looking for a {role} with experience in {skills}. "
+            f"You will design, build and maintain services used by thousands of users."
+        )
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=list(ENCODER_BACKENDS))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32])
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--docs", type=int, default=512)
+    args = parser.parse_args()
+
+    docs = synthetic_jobs(args.docs)
+    queries = [f"{r} {', '.join(SKILLS[i:i + 3])}" for i, r in enumerate(ROLES)]
+
+    reference = Encoder(EMBEDDING_MODEL, "torch", threads=args.threads)
+
+    print(f"{'backend':>8} {'batch':>6} {'sent/s':>9}  parity vs torch")
+    for backend in args.backends:
+        try:
+            encoder = Encoder(EMBEDDING_MODEL, backend, threads=args.threads)
+            # encoders load lazily; a missing runtime only shows up here
+            encoder.load()
+        except ImportError as e:
+            print(f"{backend:>8}  skipped: {e}")
+            continue
+
+        parity = ranking_parity(reference, encoder, queries, docs)
+        for batch_size in args.batch_sizes:
+            encoder.batch_size = batch_size
+            rate = throughput(encoder, docs)
+            print(f"{backend:>8} {batch_size:>6} {rate:>9.1f}  {parity}")
+
+
+if __name__ == "__main__":
+    main()
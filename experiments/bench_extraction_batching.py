@@ -0,0 +1,127 @@
+"""
+Throughput of the resume field extraction loop (utils/scraper.py) with
+per-row generation, fixed-size batches and length-sorted batches under a
+token budget.
+
+    python -m experiments.bench_extraction_batching --rows 48
+    python -m experiments.bench_extraction_batching --model <hf name or path>
+
+Without --model a randomly initialised GPT-2 (--width/--layers) and a
+word-level tokenizer are built locally: the weights do not matter for
+throughput, and nothing has to be downloaded. Keep it big enough that
+reading the weights dominates a decoding step, as it does for the real
+7B model; a toy model that fits in CPU cache shows no batching gain.
+Every row generates exactly --new-tokens tokens so the modes do the
+same amount of decoding.
+"""
+import argparse
+import contextlib
+import os
+import random
+import tempfile
+
+import pandas as pd
+
+from utils import scraper
+
+WORDS = (
+    "python java sql docker kubernetes aws developer engineer team project built designed "
+    "maintained services api backend frontend data analysis machine learning university "
+    "bachelor master experience years company skills tools education led reduced improved"
+).split()
+
+
+def synthetic_resumes(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    # resume lengths vary a lot in the real dataset: a few lines up to several pages
+    return [" ".join(rng.choices(WORDS, k=int(rng.lognormvariate(5.3, 0.8)) + 20))
+            for _ in range(n)]
+
+
+def local_model(n_positions: int, width: int, layers: int):
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+    vocab = {"[UNK]": 0, "[PAD]": 1, "[EOS]": 2}
+    prompt_words = (scraper.create_prompt(" ".join(WORDS))).split()
+    for w in WORDS + prompt_words:
+        vocab.setdefault(w, len(vocab))
+    tok = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tok.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tok, unk_token="[UNK]", pad_token="[PAD]", eos_token="[EOS]",
+        padding_side="left",
+    )
+    config = GPT2Config(vocab_size=len(vocab), n_positions=n_positions, n_embd=width,
+                        n_layer=layers, n_head=width // 64,
+                        bos_token_id=2, eos_token_id=2, pad_token_id=1)
+    return GPT2LMHeadModel(config).eval(), tokenizer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=48)
+    parser.add_argument("--new-tokens", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--token-budget", type=int, default=scraper.TOKEN_BUDGET)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--layers", type=int, default=12)
+    parser.add_argument("--modes", nargs="+", default=["per-row", "fixed", "sorted"])
+    args = parser.parse_args()
+
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
+
+    if args.model:
+        tokenizer = AutoTokenizer.from_pretrained(args.model, padding_side="left")
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        model = AutoModelForCausalLM.from_pretrained(args.model).eval()
+    else:
+        model, tokenizer = local_model(4096, args.width, args.layers)
+    model.generation_config.min_new_tokens = args.new_tokens
+    model.generation_config.pad_token_id = tokenizer.pad_token_id
+    generator = pipeline("text-generation", model=model, tokenizer=tokenizer)
+    generate = scraper.make_generate_fn(generator, tokenizer, args.new_tokens)
+    count_tokens = scraper.make_token_counter(tokenizer)
+
+    df = pd.DataFrame({"Resume": synthetic_resumes(args.rows)})
+    lengths = count_tokens([scraper.create_prompt(t) for t in df["Resume"]])
+    print(f"{args.rows} rows, prompt tokens min {min(lengths)} / "
+          f"median {sorted(lengths)[len(lengths) // 2]} / max {max(lengths)}, "
+          f"{args.new_tokens} new tokens each, {torch.get_num_threads()} threads")
+
+    fixed_plan = [list(range(k, min(k + args.batch_size, args.rows)))
+                  for k in range(0, args.rows, args.batch_size)]
+    sorted_plan = scraper.plan_batches(lengths, args.token_budget, new_tokens=args.new_tokens)
+    real = sum(lengths)
+    for name, plan in [("fixed", fixed_plan), ("sorted", sorted_plan)]:
+        padded = sum(len(b) * max(lengths[k] for k in b) for b in plan)
+        print(f"  {name} plan: {len(plan)} batches, prompt tokens {real} real / {padded} padded "
+              f"({real / padded:.0%} useful)")
+
+    modes = {
+        "per-row": dict(batch_size=1, token_budget=0),
+        "fixed": dict(batch_size=args.batch_size, token_budget=0),
+        "sorted": dict(count_tokens=count_tokens, token_budget=args.token_budget),
+    }
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp, torch.inference_mode():
+        generate(["warm up"])
+        for name in args.modes:
+            checkpoint = os.path.join(tmp, f"{name}.jsonl")
+            # silence the per-batch progress lines
+            with open(os.devnull, "w") as devnull:
+                with contextlib.redirect_stdout(devnull):
+                    stats = scraper.run_pipeline(df, generate, checkpoint,
+                                                 new_tokens=args.new_tokens, **modes[name])
+            done = scraper.load_checkpoint(checkpoint)
+            assert len(done) == args.rows, f"{name}: {len(done)}/{args.rows} rows written"
+            baseline = baseline or stats["rows_per_sec"]
+            print(f"{name:>8}: {stats['rows_per_sec']:7.2f} rows/s  {stats['batches']:4d} batches  "
+                  f"{stats['rows_per_sec'] / baseline:5.2f}x vs {args.modes[0]}")
+
+
+if __name__ == "__main__":
+    main()
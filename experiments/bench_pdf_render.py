@@ -0,0 +1,149 @@
+"""
+PDF renderer benchmark: renders N synthetic resumes, reports timings and
+checks the output for regressions.
+
+    python -m experiments.bench_pdf_render --resumes 1000
+    python -m experiments.bench_pdf_render --save-baseline pages.json
+    python -m experiments.bench_pdf_render --baseline pages.json
+
+Checks:
+  * every text line stays inside the page margins and lines on a page
+    do not overlap;
+  * all words of the input end up in the PDF;
+  * page counts match a saved baseline (if given).
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import fitz
+
+from core.pdf_writer import (
+    MARGIN_BOTTOM, MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, PAGE_HEIGHT, PAGE_WIDTH,
+    clean_text_for_pdf, create_resume_pdf, layout_cache, parse_resume_robust,
+)
+
+WORDS = (
+    "designed built maintained scalable services Python Django FastAPI PostgreSQL "
+    "Kubernetes Docker pipelines reduced latency improved reliability team mentoring "
+    "customers analytics dashboards migration cloud AWS Terraform monitoring "
+    "розробка сервісів команда підтримка"
+).split()
+SECTIONS = ["SUMMARY", "EXPERIENCE", "PROJECTS", "EDUCATION", "SKILLS", "LANGUAGES"]
+TOLERANCE = 0.5
+
+
+def synthetic_resume(rng: random.Random) -> str:
+    parts = []
+    for section in SECTIONS:
+        parts.append(f"**{section}**")
+        if section == "SUMMARY":
+            parts.append(" ".join(rng.choices(WORDS, k=rng.randint(30, 80))))
+            continue
+        for _ in range(rng.randint(1, 4)):
+            parts.append(f"Role {rng.randint(1, 99)} | Company | 2020 - 2024")
+            for _ in range(rng.randint(2, 7)):
+                parts.append("* " + " ".join(rng.choices(WORDS, k=rng.randint(6, 40))))
+    return "\n".join(parts)
+
+
+def check_pdf(path: str, raw_text: str) -> list[str]:
+    problems = []
+    doc = fitz.open(path)
+    text = []
+    for pno, page in enumerate(doc):
+        boxes = []
+        for block in page.get_text("dict")["blocks"]:
+            for line in block.get("lines", []):
+                x0, y0, x1, y1 = line["bbox"]
+                if (x0 < MARGIN_LEFT - TOLERANCE
+                        or x1 > PAGE_WIDTH - MARGIN_RIGHT + TOLERANCE
+                        or y0 < MARGIN_TOP - TOLERANCE - 2
+                        or y1 > PAGE_HEIGHT - MARGIN_BOTTOM + TOLERANCE + 4):
+                    problems.append(f"page {pno}: line outside margins {line['bbox']}")
+                boxes.append((y0, y1))
+        boxes.sort()
+        for (a0, a1), (b0, b1) in zip(boxes, boxes[1:]):
+            if b0 < a1 - 1.5:
+                problems.append(f"page {pno}: overlapping lines at y={b0:.1f}")
+        text.append(page.get_text())
+
+    rendered = set(" ".join(text).split())
+    expected = set(clean_text_for_pdf(raw_text).replace("*", " ").split())
+    missing = [w for w in expected if w not in rendered and len(w) > 2]
+    if missing:
+        problems.append(f"missing words: {missing[:5]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check-every", type=int, default=10,
+                        help="run the text/margin checks on every n-th resume")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--save-baseline", default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    resumes = [synthetic_resume(rng) for _ in range(args.resumes)]
+    profile = {"full_name": "Jane Doe", "email": "jane@example.com", "location": "Kyiv"}
+
+    times, pages, sizes, problems = [], [], [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume.pdf")
+        for i, raw in enumerate(resumes):
+            stats = {}
+            t = time.perf_counter()
+            create_resume_pdf(parse_resume_robust(raw), profile, path, stats)
+            times.append(time.perf_counter() - t)
+            pages.append(stats["pages"])
+            sizes.append(stats["bytes"])
+            if args.check_every and i % args.check_every == 0:
+                problems += [f"resume {i}: {p}" for p in check_pdf(path, raw)]
+
+        # re-render the last resume to show what the layout cache saves
+        stats = {}
+        create_resume_pdf(parse_resume_robust(resumes[-1]), profile, path, stats)
+
+    times.sort()
+    print(f"rendered {len(times)} resumes in {sum(times):.2f}s")
+    print(f"  mean {statistics.mean(times) * 1000:.1f} ms, "
+          f"p50 {times[len(times) // 2] * 1000:.1f} ms, "
+          f"p95 {times[int(len(times) * 0.95)] * 1000:.1f} ms")
+    print(f"  pages: mean {statistics.mean(pages):.2f}, max {max(pages)}")
+    print(f"  size: mean {statistics.mean(sizes) / 1024:.1f} KB, max {max(sizes) / 1024:.1f} KB")
+    print(f"  cached re-render: {stats['seconds'] * 1000:.1f} ms "
+          f"({stats['reused']}/{stats['sections']} sections reused, "
+          f"{layout_cache.hits} hits / {layout_cache.misses} misses overall)")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"seed": args.seed, "pages": pages}, f)
+        print(f"baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["seed"] != args.seed or len(baseline["pages"]) != len(pages):
+            problems.append("baseline was recorded with a different seed/size")
+        else:
+            changed = [i for i, (a, b) in enumerate(zip(baseline["pages"], pages)) if a != b]
+            if changed:
+                problems.append(f"page count changed for {len(changed)} resumes, e.g. {changed[:5]}")
+
+    if problems:
+        print(f"{len(problems)} problem(s):")
+        for p in problems[:20]:
+            print("  " + p)
+        raise SystemExit(1)
+    print("checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Prefill time with and without the cached system-prompt prefix.
+
+Each measurement generates a single token, so the time is almost
+entirely prompt evaluation.
+
+    python -m experiments.bench_prefix_cache --runs 3
+"""
+import argparse
+import tempfile
+import time
+
+from core.cv_generator import build_prompt_parts, get_llm
+from core.kv_cache import PrefixCache
+
+PROFILES = [
+    {"position": "Senior Python Developer", "skills": "Python, Django, PostgreSQL, AWS",
+     "summary": "8 years of backend development for fintech products."},
+    {"position": "QA Automation Engineer", "skills": "Java, Selenium, TestNG, Jenkins",
+     "summary": "Built UI and API test frameworks from scratch."},
+    {"position": "Data Scientist", "skills": "Python, PyTorch, SQL, Airflow",
+     "summary": "Recommendation models for e-commerce, A/B testing."},
+]
+
+
+def prefill(llm, prompt: str) -> float:
+    start = time.perf_counter()
+    llm(prompt, max_tokens=1, temperature=0.0)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    llm = get_llm()
+    prefix, _ = build_prompt_parts(PROFILES[0])
+    prefix_len = len(llm.tokenize(prefix.encode("utf-8"), special=True))
+
+    cold = []
+    for i in range(args.runs):
+        prefix, suffix = build_prompt_parts(PROFILES[i % len(PROFILES)])
+        llm.reset()
+        cold.append(prefill(llm, prefix + suffix))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = PrefixCache(disk=True, directory=cache_dir)
+
+        llm.reset()
+        start = time.perf_counter()
+        cache.prepare(llm, prefix)
+        prime = time.perf_counter() - start
+
+        ram, disk = [], []
+        for i in range(args.runs):
+            prefix, suffix = build_prompt_parts(PROFILES[i % len(PROFILES)])
+
+            llm.reset()  # force a restore from RAM instead of the live context
+            start = time.perf_counter()
+            cache.prepare(llm, prefix)
+            ram.append(time.perf_counter() - start + prefill(llm, prefix + suffix))
+
+            llm.reset()
+            fresh = PrefixCache(disk=True, directory=cache_dir)
+            start = time.perf_counter()
+            fresh.prepare(llm, prefix)
+            disk.append(time.perf_counter() - start + prefill(llm, prefix + suffix))
+
+    avg = lambda xs: sum(xs) / len(xs)
+    print(f"prefix: {prefix_len} tokens (priming once took {prime:.2f} s)")
+    print(f"no cache:          {avg(cold):.2f} s per prompt")
+    print(f"cache (RAM):       {avg(ram):.2f} s per prompt ({avg(cold) / avg(ram):.1f}x)")
+    print(f"cache (from disk): {avg(disk):.2f} s per prompt ({avg(cold) / avg(disk):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Startup-time benchmark. Each phase runs in a fresh interpreter so
+import costs are measured cold:
+
+- import:    importing the app's core modules (what runs before the window)
+- embedder:  loading the SentenceTransformer + stored corpus
+- llm:       loading the GGUF model
+
+    python -m experiments.bench_startup [--skip-llm]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+PHASE_SCRIPT = r"""
+import json, time
+t0 = time.perf_counter()
+import core.rag_engine as rag
+import core.cv_generator as gen
+import core.pdf_writer, core.storage
+t_import = time.perf_counter() - t0
+result = {"import": t_import}
+if "embedder" in PHASES:
+    t0 = time.perf_counter()
+    rag.recommender.warmup()
+    result["embedder"] = time.perf_counter() - t0
+if "llm" in PHASES:
+    t0 = time.perf_counter()
+    gen.warmup()
+    result["llm"] = time.perf_counter() - t0
+print(json.dumps(result))
+"""
+
+
+def run_phases(phases: list[str]) -> dict:
+    code = f"PHASES = {phases!r}\n" + PHASE_SCRIPT
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skip-llm", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    phases = ["embedder"] if args.skip_llm else ["embedder", "llm"]
+    runs = [run_phases(phases) for _ in range(args.repeat)]
+
+    for phase in ["import"] + phases:
+        times = sorted(r[phase] for r in runs)
+        print(f"{phase:>9}: median {times[len(times) // 2]:.2f} s "
+              f"(min {times[0]:.2f}, max {times[-1]:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Storage benchmark: the SQLite store against the previous one-JSON-file-
+per-record layout, at N profiles and N history entries.
+
+    python -m experiments.bench_storage --records 100000
+    python -m experiments.bench_storage --records 100000 --legacy 20000
+
+History texts are drawn so that ~30% repeat an earlier one (cached or
+re-saved generations), to show deduplication and compression.
+
+Runs in a temporary directory; the app's own .cv_app is not touched.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from core.store import LEGACY_TS_FORMAT, Store
+
+
+def legacy_load_latest_profile(profiles_dir):
+    # the directory-scan implementation the store replaced
+    files = [f for f in os.listdir(profiles_dir) if f.endswith(".json")]
+    dated = []
+    for f in files:
+        try:
+            dated.append((datetime.strptime("_".join(f.split("_", 2)[:2]), LEGACY_TS_FORMAT), f))
+        except ValueError:
+            pass
+    dated.sort(key=lambda x: x[0], reverse=True)
+    with open(os.path.join(profiles_dir, dated[0][1]), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def timed(fn, repeat: int) -> float:
+    """Median seconds per call."""
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return statistics.median(samples)
+
+
+def profile(i: int) -> dict:
+    return {"full_name": f"User {i}", "position": "Python Developer",
+            "skills": "Python, SQL, Docker", "summary": "Builds backend services. " * 5}
+
+
+VOCAB = (
+    "designed built maintained scalable services Python Django FastAPI PostgreSQL "
+    "Kubernetes Docker pipelines reduced latency improved reliability team mentoring "
+    "customers analytics dashboards migration cloud AWS Terraform monitoring SUMMARY "
+    "EXPERIENCE EDUCATION SKILLS projects university bachelor 2019 2021 2023"
+).split()
+
+
+def cv_text(k: int) -> str:
+    rng = random.Random(k)
+    lines = [f"**CV {k}**"]
+    for _ in range(25):
+        lines.append("* " + " ".join(rng.choices(VOCAB, k=rng.randint(6, 14))))
+    return "\n".join(lines)
+
+
+def fmt(seconds: float) -> str:
+    return f"{seconds * 1e6:>10.1f} µs"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--legacy", type=int, default=None,
+                        help="JSON files for the legacy comparison (default: --records, 0 to skip)")
+    args = parser.parse_args()
+    legacy_n = args.records if args.legacy is None else args.legacy
+    rng = random.Random(0)
+    start_ts = datetime(2024, 1, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Store(Path(tmp) / "store.sqlite3")
+        names = []
+        t = time.perf_counter()
+        for i in range(args.records):
+            ts = start_ts + timedelta(seconds=37 * i)
+            name = f"{ts.strftime(LEGACY_TS_FORMAT)}_{i}_profile"
+            store.put_profile(name, profile(i), ts.timestamp())
+            names.append(name)
+        write_profiles = time.perf_counter() - t
+        distinct = int(args.records * 0.7)
+        history_times = []
+        for i in range(args.records):
+            text = cv_text(rng.randrange(distinct))
+            t = time.perf_counter()
+            store.add_history(f"profile_{i % 500}", text)
+            history_times.append(time.perf_counter() - t)
+        size = sum(f.stat().st_size for f in Path(tmp).glob("store.sqlite3*"))
+        counts = store.counts()
+        head = statistics.median(history_times[:1000])
+        tail = statistics.median(history_times[-1000:])
+
+        print(f"sqlite store: {counts['profiles']} profiles, {counts['cv_history']} history "
+              f"entries, {counts['cv_texts']} distinct texts ({size / 1e6:.1f} MB on disk)")
+        print(f"  history texts: {counts['text_bytes'] / 1e6:.1f} MB raw -> "
+              f"{counts['stored_bytes'] / 1e6:.1f} MB stored")
+        print(f"  save profile             {fmt(write_profiles / args.records)}")
+        print(f"  save history, first 1k   {fmt(head)}")
+        print(f"  save history, last 1k    {fmt(tail)}")
+        print(f"  latest profile           {fmt(timed(store.latest_profile, 1000))}")
+        print(f"  profile by name          {fmt(timed(lambda: store.get_profile(rng.choice(names)), 1000))}")
+        print(f"  list profiles (page 50)  {fmt(timed(lambda: store.profile_names(50), 1000))}")
+        print(f"  list all profile names   {fmt(timed(store.profile_names, 5))}")
+        print(f"  history page (50)        {fmt(timed(lambda: store.history(50), 1000))}")
+        mid = args.records // 2
+        print(f"  history page, deep       {fmt(timed(lambda: store.history(50, before=mid), 1000))}")
+        print(f"  history page, 1 profile  {fmt(timed(lambda: store.history(50, profile_name='profile_7'), 1000))}")
+        store.close()
+
+        if legacy_n:
+            profiles_dir = Path(tmp) / "profiles"
+            profiles_dir.mkdir()
+            for i in range(legacy_n):
+                ts = start_ts + timedelta(seconds=37 * i)
+                with open(profiles_dir / f"{ts.strftime(LEGACY_TS_FORMAT)}_{i}_profile.json",
+                          "w", encoding="utf-8") as f:
+                    json.dump(profile(i), f, indent=2, ensure_ascii=False)
+            some = next(iter(profiles_dir.glob("*.json")))
+
+            print(f"legacy JSON files: {legacy_n} profiles")
+            print(f"  latest profile           {fmt(timed(lambda: legacy_load_latest_profile(profiles_dir), 5))}")
+            print(f"  profile by name          {fmt(timed(lambda: json.loads(some.read_text('utf-8')), 1000))}")
+            print(f"  list all profile names   {fmt(timed(lambda: [p.stem for p in profiles_dir.glob('*.json')], 5))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: serial vs concurrent work.ua description fetching
+against a local fake work.ua server, then a cold vs warm run
+through the on-disk HTTP cache.
+
+    python -m experiments.bench_workua_fetch --jobs 50 --latency 0.1
+"""
+import argparse
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fetchers.http_cache import HttpCache
+from fetchers.http_client import configure_client, http_stats
+from fetchers.workua_fetcher import fetch_workua_jobs
+
+
+def make_handler(n_jobs: int, latency: float):
+    class FakeWorkUA(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, body: str, status: int = 200):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            if self.path.startswith("/jobs/"):
+                job_id = self.path.strip("/").split("/")[-1]
+                self.send_header("ETag", f'"job-{job_id}"')
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            time.sleep(latency)
+            if self.path.startswith("/jobs-"):
+                items = "".join(
+                    f'<div class="job-link"><h2><a href="/jobs/{i}/">Job {i}</a></h2>'
+                    f'<div class="add-top-xs"><span>Company {i}</span></div></div>'
+                    for i in range(n_jobs)
+                )
+                self._send(f"<html><body>{items}</body></html>")
+            elif self.path.startswith("/jobs/"):
+                job_id = self.path.strip("/").split("/")[-1]
+                if job_id == "13":
+                    self._send("gone", status=404)
+                    return
+                etag = f'"job-{job_id}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self._send(
+                    f'<html><body><div id="job-description">'
+                    f"Description of job {job_id}</div></body></html>"
+                )
+            else:
+                self._send("not found", status=404)
+
+    return FakeWorkUA
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_handler(args.jobs, args.latency)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        configure_client(cache=None)
+
+        t0 = time.perf_counter()
+        serial = fetch_workua_jobs(
+            "python", args.jobs, max_workers=1, min_interval=0, host=host
+        )
+        t_serial = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        concurrent = fetch_workua_jobs(
+            "python", args.jobs, max_workers=args.workers,
+            per_host=args.workers, min_interval=0, host=host
+        )
+        t_concurrent = time.perf_counter() - t0
+
+        same = serial.to_dict("records") == concurrent.to_dict("records")
+        print(f"jobs: {len(serial)}  latency: {args.latency * 1000:.0f} ms")
+        print(f"serial:     {t_serial:.2f} s")
+        print(f"concurrent: {t_concurrent:.2f} s  ({args.workers} workers)")
+        print(f"speedup:    {t_serial / t_concurrent:.1f}x")
+        print(f"identical ordered results: {same}")
+
+        stats = http_stats()
+        print(f"http: {stats['requests']} requests, {stats['retries']} retries, "
+              f"{stats['bytes_wire']} bytes, avg {stats['avg_latency_ms']:.0f} ms")
+        print(f"latency histogram: {stats['latency_hist']}")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            print()
+            for label, ttl in (("cold", None), ("warm", None), ("revalidate", 0)):
+                cache = HttpCache(cache_dir, default_ttl=3600)
+                client = configure_client(cache=cache)
+                if ttl == 0:
+                    # force every entry stale so the run exercises 304s
+                    for meta_path in cache.directory.glob("*.json"):
+                        meta = json.loads(meta_path.read_text())
+                        meta["expires"] = 0
+                        meta_path.write_text(json.dumps(meta))
+                t0 = time.perf_counter()
+                fetch_workua_jobs(
+                    "python", args.jobs, max_workers=args.workers,
+                    per_host=args.workers, min_interval=0, host=host
+                )
+                elapsed = time.perf_counter() - t0
+                net = client.stats.snapshot()
+                c = cache.snapshot()
+                print(f"{label:>10}: {elapsed:.2f} s, {net['requests']} requests, "
+                      f"{net['bytes_wire']} network bytes, "
+                      f"hits={c['hits']} revalidated={c['revalidated']} misses={c['misses']}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Minimal OpenAI-compatible completion server for exercising the HTTP
+LLM backend without a model. It streams a canned resume word by word
+(with some non-ASCII text, as raw UTF-8) and implements /v1/models and llama.cpp's /tokenize (whitespace split).
+
+    python -m experiments.stub_llm_server --port 8080
+    CV_LLM_BACKEND=http CV_LLM_URL=http://127.0.0.1:8080 python app.py
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED = """Plan:
+- Lead with the target role and strongest skills
+- Quantify impact in experience bullets
+
+Resume:
+Summary
+Backend engineer with a focus on reliable, well-tested services.
+
+Skills
+* Python, SQL, Docker
+• Мови – українська, англійська
+"""
+
+
+def make_handler(delay: float):
+    class StubLLM(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _json(self, payload: dict, status: int = 200):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _body(self) -> dict:
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            if self.path == "/v1/models":
+                self._json({"object": "list", "data": [{"id": "stub-model"}]})
+            else:
+                self._json({"error": "not found"}, status=404)
+
+        def do_POST(self):
+            body = self._body()
+            if self.path == "/tokenize":
+                self._json({"tokens": list(range(len(body.get("content", "").split())))})
+            elif self.path == "/v1/completions":
+                self._complete(body)
+            else:
+                self._json({"error": "not found"}, status=404)
+
+        def _complete(self, body: dict):
+            words = CANNED.split(" ")[:body.get("max_tokens", 1200)]
+            pieces = [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+            if not body.get("stream"):
+                self._json({"choices": [{"text": "".join(pieces), "index": 0}]})
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            try:
+                for piece in pieces:
+                    event = {"choices": [{"text": piece, "index": 0}]}
+                    # raw UTF-8 and no charset in the header, like llama-server
+                    data = json.dumps(event, ensure_ascii=False)
+                    self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    time.sleep(delay)
+                self.wfile.write(b"data: [DONE]\n\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client cancelled
+            self.close_connection = True
+
+    return StubLLM
+
+
+def serve(port: int = 0, delay: float = 0.01) -> ThreadingHTTPServer:
+    return ThreadingHTTPServer(("127.0.0.1", port), make_handler(delay))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--delay", type=float, default=0.02,
+                        help="seconds between streamed tokens")
+    args = parser.parse_args()
+
+    server = serve(args.port, args.delay)
+    print(f"stub LLM server on http://127.0.0.1:{server.server_port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
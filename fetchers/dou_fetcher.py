@@ -1,14 +1,15 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-from fetchers.headers import get_headers
+from fetchers.http_client import http_get
+
+LISTING_TTL = 15 * 60
 
 def fetch_dou_jobs(query: str, count: int = 30):
     base_url = "https://jobs.dou.ua/vacancies/"
     params = {"search": query}
     
     try:
-        response = requests.get(base_url, params=params, headers=get_headers())
+        response = http_get(base_url, params=params, ttl=LISTING_TTL)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, "html.parser")
     except Exception as e:
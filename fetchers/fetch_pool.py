@@ -0,0 +1,70 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class HostThrottle:
+    """
+    Per-host politeness: caps the number of in-flight requests
+    to one host and spaces out request starts by `min_interval` seconds.
+    """
+
+    def __init__(self, per_host: int = 4, min_interval: float = 0.05):
+        self.per_host = max(1, per_host)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    def _slot(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[host]
+
+    def _wait_turn(self, host: str):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def run(self, url: str, fn, *args, **kwargs):
+        host = urlparse(url).netloc
+        with self._slot(host):
+            self._wait_turn(host)
+            return fn(url, *args, **kwargs)
+
+
+def fetch_all(urls, fetch_fn, max_workers: int = 8, per_host: int = 4,
+              min_interval: float = 0.05, default=""):
+    """
+    Runs `fetch_fn(url)` for every url concurrently and returns the
+    results in the same order as `urls`.
+
+    A failure for one url never affects the others: its slot gets
+    `default` and the error is printed.
+    """
+    urls = list(urls)
+    if not urls:
+        return []
+
+    throttle = HostThrottle(per_host=per_host, min_interval=min_interval)
+
+    def task(url):
+        if not url:
+            return default
+        try:
+            return throttle.run(url, fetch_fn)
+        except Exception as e:
+            print(f"[fetch_pool] Error fetching {url}: {e}")
+            return default
+
+    if max_workers <= 1:
+        return [task(u) for u in urls]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        return list(pool.map(task, urls))
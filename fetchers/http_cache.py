@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = PROJECT_ROOT / ".cv_app" / "http_cache"
+
+DEFAULT_TTL = 15 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Request headers that change what the server returns, so they are part of the key.
+VARY_HEADERS = ("Accept", "Accept-Language")
+# Response headers kept alongside the body.
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+def _max_age(cache_control: str):
+    for part in (cache_control or "").split(","):
+        part = part.strip().lower()
+        if part in ("no-store", "no-cache"):
+            return 0
+        if part.startswith("max-age="):
+            try:
+                return int(part.split("=", 1)[1])
+            except ValueError:
+                return None
+    return None
+
+
+class HttpCache:
+    """
+    Persistent on-disk cache for GET responses.
+
+    Every entry is a `<key>.body` file plus a `<key>.json` metadata file;
+    the key is a hash of the final URL and the VARY_HEADERS. The metadata
+    file's mtime doubles as the last-access time, which drives LRU eviction
+    once the cache grows over `max_bytes`.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 default_ttl: float = DEFAULT_TTL):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_served = 0
+
+        self._total_bytes = sum(
+            p.stat().st_size for p in self.directory.glob("*.body")
+        )
+
+    # ---------- keys & files ----------
+
+    def key(self, url: str, headers=None) -> str:
+        headers = CaseInsensitiveDict(headers or {})
+        parts = [url] + [f"{h}:{headers.get(h, '')}" for h in VARY_HEADERS]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def _write_atomic(self, path: Path, data: bytes):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    # ---------- lookup ----------
+
+    def lookup(self, key: str):
+        """
+        Returns (meta, body) for a stored entry or None.
+        """
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return meta, body
+
+    def is_fresh(self, meta: dict) -> bool:
+        return time.time() < meta.get("expires", 0)
+
+    def conditional_headers(self, meta: dict) -> dict:
+        headers = {}
+        stored = meta.get("headers", {})
+        if stored.get("ETag"):
+            headers["If-None-Match"] = stored["ETag"]
+        if stored.get("Last-Modified"):
+            headers["If-Modified-Since"] = stored["Last-Modified"]
+        return headers
+
+    # ---------- store ----------
+
+    def _expires(self, headers, ttl) -> float:
+        """
+        An explicit ttl is our own policy and wins; otherwise the
+        server's max-age is used, then the cache default.
+        """
+        if ttl is None:
+            max_age = _max_age(headers.get("Cache-Control", ""))
+            ttl = self.default_ttl if max_age is None else max_age
+        return time.time() + ttl
+
+    def store(self, key: str, resp: requests.Response, ttl=None):
+        headers = {h: resp.headers[h] for h in STORED_HEADERS if h in resp.headers}
+        body = resp.content
+        meta = {
+            "url": resp.url,
+            "status": resp.status_code,
+            "encoding": resp.encoding,
+            "headers": headers,
+            "stored_at": time.time(),
+            "expires": self._expires(resp.headers, ttl),
+            "size": len(body),
+        }
+
+        meta_path, body_path = self._paths(key)
+        old_size = body_path.stat().st_size if body_path.exists() else 0
+
+        self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+        with self._lock:
+            self.stores += 1
+            self._total_bytes += len(body) - old_size
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def refresh(self, key: str, meta: dict, resp: requests.Response, ttl=None):
+        """
+        Extends an entry after a 304 Not Modified.
+        """
+        for h in ("ETag", "Last-Modified", "Cache-Control"):
+            if h in resp.headers:
+                meta["headers"][h] = resp.headers[h]
+        meta["expires"] = self._expires(
+            CaseInsensitiveDict(meta["headers"]), ttl
+        )
+        meta_path, _ = self._paths(key)
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def evict(self):
+        """
+        Drops least recently used entries until the cache is
+        at 90% of max_bytes.
+        """
+        entries = []
+        for meta_path in self.directory.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                entries.append((
+                    meta_path.stat().st_mtime,
+                    body_path.stat().st_size,
+                    meta_path, body_path,
+                ))
+            except OSError:
+                continue
+        entries.sort()
+
+        target = int(self.max_bytes * 0.9)
+        total = sum(e[1] for e in entries)
+        evicted = 0
+        for _, size, meta_path, body_path in entries:
+            if total <= target:
+                break
+            for p in (meta_path, body_path):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._total_bytes = total
+            self.evictions += evicted
+
+    def clear(self):
+        for p in self.directory.iterdir():
+            if p.suffix in (".json", ".body", ".tmp"):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+        with self._lock:
+            self._total_bytes = 0
+
+    # ---------- responses & stats ----------
+
+    def to_response(self, meta: dict, body: bytes) -> requests.Response:
+        resp = requests.Response()
+        resp._content = body
+        resp.status_code = meta.get("status", 200)
+        resp.url = meta.get("url", "")
+        resp.encoding = meta.get("encoding")
+        resp.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        resp.headers["X-Cache"] = "HIT"
+        return resp
+
+    def record(self, outcome: str, served: int = 0):
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "revalidated":
+                self.revalidated += 1
+            else:
+                self.misses += 1
+            self.bytes_served += served
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_ratio": (
+                    (self.hits + self.revalidated) / lookups if lookups else 0.0
+                ),
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "bytes_served": self.bytes_served,
+                "size_bytes": self._total_bytes,
+            }
+
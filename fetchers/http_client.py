@@ -0,0 +1,235 @@
+import bisect
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from fetchers.headers import get_headers
+from fetchers.http_cache import HttpCache
+
+try:
+    import brotli  # noqa: F401 -- lets urllib3 decode "br" responses
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (5, 20)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.3
+DEFAULT_JITTER = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class HttpStats:
+    """
+    Thread-safe counters for everything that goes through HttpClient.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.retries = 0
+            self.bytes_wire = 0
+            self.bytes_decoded = 0
+            self.total_latency = 0.0
+            self.latency_hist = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            self.per_host = {}
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record(self, host: str, latency: float, wire: int = 0,
+               decoded: int = 0, error: bool = False):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, latency * 1000)
+        with self._lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.bytes_wire += wire
+            self.bytes_decoded += decoded
+            self.total_latency += latency
+            self.latency_hist[bucket] += 1
+
+            host_stats = self.per_host.setdefault(
+                host, {"requests": 0, "bytes": 0, "latency": 0.0}
+            )
+            host_stats["requests"] += 1
+            host_stats["bytes"] += wire
+            host_stats["latency"] += latency
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS]
+            labels.append(f">{LATENCY_BUCKETS_MS[-1]}ms")
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "bytes_wire": self.bytes_wire,
+                "bytes_decoded": self.bytes_decoded,
+                "avg_latency_ms": (
+                    self.total_latency / self.requests * 1000
+                    if self.requests else 0.0
+                ),
+                "latency_hist": dict(zip(labels, self.latency_hist)),
+                "per_host": {h: dict(s) for h, s in self.per_host.items()},
+            }
+
+
+class HttpClient:
+    """
+    One pooled requests.Session shared by all fetchers.
+
+    Connections are kept alive per host (urllib3 keeps one pool per
+    host), failed requests are retried with jittered exponential
+    backoff, and every call gets connect/read timeouts.
+
+    With a `cache`, fresh responses are served from disk and stale ones
+    are revalidated with If-None-Match / If-Modified-Since.
+    """
+
+    def __init__(self, pool_hosts: int = 10, pool_maxsize: int = 16,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF,
+                 jitter: float = DEFAULT_JITTER,
+                 timeout=DEFAULT_TIMEOUT, cache: HttpCache | None = None):
+        self.timeout = timeout
+        self.cache = cache
+        self.stats = HttpStats()
+        stats = self.stats
+
+        class CountingRetry(Retry):
+            def increment(self, *args, **kwargs):
+                new_retry = super().increment(*args, **kwargs)
+                stats.record_retry()
+                return new_retry
+
+        retry = CountingRetry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            backoff_jitter=jitter,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(get_headers())
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+    def _send(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlparse(url).netloc
+
+        start = time.perf_counter()
+        try:
+            resp = self.session.get(url, **kwargs)
+            decoded = len(resp.content)
+        except Exception:
+            self.stats.record(host, time.perf_counter() - start, error=True)
+            raise
+
+        try:
+            wire = resp.raw.tell() or decoded
+        except Exception:
+            wire = decoded
+
+        self.stats.record(
+            host, time.perf_counter() - start,
+            wire=wire, decoded=decoded, error=resp.status_code >= 400,
+        )
+        return resp
+
+    def get(self, url: str, ttl: float | None = None, use_cache: bool = True,
+            **kwargs) -> requests.Response:
+        """
+        GET through the pool. `ttl` (seconds) overrides how long a
+        cached copy is served without asking the server again.
+        """
+        if self.cache is None or not use_cache:
+            return self._send(url, **kwargs)
+
+        params = kwargs.pop("params", None)
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        headers = dict(self.session.headers)
+        headers.update(kwargs.get("headers") or {})
+        key = self.cache.key(full_url, headers)
+
+        cached = self.cache.lookup(key)
+        if cached is not None:
+            meta, body = cached
+            if self.cache.is_fresh(meta):
+                self.cache.record("hit", len(body))
+                return self.cache.to_response(meta, body)
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                **self.cache.conditional_headers(meta),
+            }
+
+        resp = self._send(full_url, **kwargs)
+
+        if cached is not None and resp.status_code == 304:
+            self.cache.refresh(key, meta, resp, ttl)
+            self.cache.record("revalidated", len(body))
+            return self.cache.to_response(meta, body)
+
+        self.cache.record("miss")
+        if resp.status_code == 200:
+            self.cache.store(key, resp, ttl)
+        return resp
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(cache=HttpCache())
+        return _client
+
+
+def configure_client(**kwargs) -> HttpClient:
+    """
+    Replaces the shared client, e.g. configure_client(cache=None)
+    to bypass the on-disk cache.
+    """
+    global _client
+    with _client_lock:
+        _client = HttpClient(**kwargs)
+        return _client
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    return get_client().get(url, **kwargs)
+
+
+def http_stats() -> dict:
+    client = get_client()
+    stats = client.stats.snapshot()
+    stats["cache"] = client.cache.snapshot() if client.cache else None
+    return stats
@@ -1,16 +1,31 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-from fetchers.headers import get_headers
+from fetchers.http_client import http_get
+from fetchers.fetch_pool import fetch_all
 
+WORKUA_HOST = "https://www.work.ua"
 
-def fetch_workua_jobs(query: str, count: int = 30):
-    base_url = "https://www.work.ua/jobs-"
+# Description pages are fetched concurrently; these keep us polite to work.ua.
+MAX_CONCURRENT_FETCHES = 8
+PER_HOST_CONCURRENCY = 4
+PER_HOST_MIN_INTERVAL = 0.05
+
+# How long cached pages are trusted before revalidating with the server.
+LISTING_TTL = 15 * 60
+VACANCY_TTL = 7 * 24 * 3600
+
+
+def fetch_workua_jobs(query: str, count: int = 30,
+                      max_workers: int = MAX_CONCURRENT_FETCHES,
+                      per_host: int = PER_HOST_CONCURRENCY,
+                      min_interval: float = PER_HOST_MIN_INTERVAL,
+                      host: str = WORKUA_HOST):
+    base_url = f"{host}/jobs-"
     query_slug = query.lower().replace(" ", "-")
     url = f"{base_url}{query_slug}/"
 
     try:
-        response = requests.get(url, headers=get_headers())
+        response = http_get(url, ttl=LISTING_TTL)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, "html.parser")
     except Exception as e:
@@ -24,25 +39,33 @@ def fetch_workua_jobs(query: str, count: int = 30):
 
         title = title_tag.text.strip() if title_tag else ""
         company = company_tag.text.strip() if company_tag else ""
-        job_url = "https://www.work.ua" + title_tag["href"] if title_tag else ""
-
-        description = fetch_workua_description(job_url)
+        job_url = host + title_tag["href"] if title_tag else ""
 
         jobs.append({
             "title": title,
             "company": company,
             "location": None,
-            "description": description,
+            "description": "",
             "url": job_url,
             "source": "work.ua"
         })
 
+    descriptions = fetch_all(
+        [job["url"] for job in jobs],
+        fetch_workua_description,
+        max_workers=max_workers,
+        per_host=per_host,
+        min_interval=min_interval,
+    )
+    for job, description in zip(jobs, descriptions):
+        job["description"] = description
+
     return pd.DataFrame(jobs)
 
 
 def fetch_workua_description(vacancy_url: str) -> str:
     try:
-        resp = requests.get(vacancy_url, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http_get(vacancy_url, ttl=VACANCY_TTL)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, "html.parser")
         desc_tag = soup.select_one("div#job-description")
@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from core.llm_backend import HTTPBackend
+from experiments.stub_llm_server import CANNED, serve
+
+
+@pytest.fixture
+def server():
+    server = serve(0, delay=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def backend(server):
+    return HTTPBackend(f"http://127.0.0.1:{server.server_port}", timeout=(2, 10))
+
+
+def test_stream_yields_the_whole_completion(backend):
+    chunks = list(backend.stream("prompt", max_tokens=1200))
+    assert len(chunks) > 1
+    assert "".join(chunks) == CANNED
+
+
+def test_stream_decodes_utf8(backend):
+    text = "".join(backend.stream("prompt", max_tokens=1200))
+    assert "• Мови – українська, англійська" in text
+
+
+def test_stream_respects_max_tokens(backend):
+    chunks = list(backend.stream("prompt", max_tokens=3))
+    assert len(chunks) == 3
+
+
+def test_tokenize(backend):
+    assert backend.tokenize("one two three".encode("utf-8")) == [0, 1, 2]
+
+
+def test_model_id(backend):
+    assert backend.model_id() == "http:stub-model"
+
+
+def test_model_id_unreachable():
+    with pytest.raises(ConnectionError):
+        HTTPBackend("http://127.0.0.1:9", timeout=(0.5, 0.5)).model_id()
+
+
+def test_closing_the_stream_early(backend):
+    # the full canned answer takes over a second at 50 ms per token
+    start = time.perf_counter()
+    stream = backend.stream("prompt", max_tokens=1200)
+    first = next(stream)
+    stream.close()
+    assert first
+    assert time.perf_counter() - start < 0.5
+
+    # the connection was dropped cleanly, the next request works
+    assert "".join(backend.stream("prompt", max_tokens=2))
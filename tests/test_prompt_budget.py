@@ -0,0 +1,26 @@
+import pytest
+
+from core.prompt_budget import PromptBudget
+
+
+class WordTokenizer:
+    def tokenize(self, text: bytes, add_bos: bool = False, special: bool = True) -> list[int]:
+        return list(range(len(text.decode("utf-8").split())))
+
+
+def make_prefix(system_instruction: str) -> str:
+    return f"<start_of_turn>user\n{system_instruction}\n"
+
+
+def test_max_tokens_fills_the_remaining_context():
+    budget = PromptBudget(n_ctx=8192, max_new_tokens=1200, min_new_tokens=600)
+    plan = budget.plan(WordTokenizer(), "Python developer", "short suffix", make_prefix)
+    assert 600 <= plan.max_tokens <= 1200
+    assert plan.prompt_tokens + plan.max_tokens <= 8192
+
+
+def test_prompt_that_fills_the_context_raises():
+    budget = PromptBudget(n_ctx=2048, max_new_tokens=1200, min_new_tokens=600)
+    suffix = "word " * 3000
+    with pytest.raises(ValueError, match="context tokens"):
+        budget.plan(WordTokenizer(), "Python developer", suffix, make_prefix)
@@ -0,0 +1,106 @@
+import re
+
+import pandas as pd
+
+from utils import scraper
+
+GENERATED = "Skills: Python, SQL\nEducation: BSc Computer Science"
+
+
+def make_df(n: int) -> pd.DataFrame:
+    return pd.DataFrame({"Resume": [f"row-{i} python developer" for i in range(n)]})
+
+
+def row_of(prompt: str) -> int:
+    return int(re.search(r"row-(\d+)", prompt).group(1))
+
+
+class StubGenerate:
+    """
+    generate(prompts) -> texts that records every call and fails like a
+    model running out of memory on batches larger than `max_rows`.
+    """
+
+    def __init__(self, max_rows: int | None = None, poison: set = frozenset()):
+        self.max_rows = max_rows
+        self.poison = poison
+        self.calls = []
+
+    def __call__(self, prompts):
+        rows = [row_of(p) for p in prompts]
+        self.calls.append(rows)
+        if self.max_rows is not None and len(rows) > self.max_rows:
+            raise MemoryError("CUDA out of memory")
+        if self.poison & set(rows):
+            raise ValueError("bad row")
+        return [GENERATED for _ in rows]
+
+
+def test_resume_skips_checkpointed_rows(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    df = make_df(10)
+
+    first = StubGenerate()
+    stats = scraper.run_pipeline(df, first, checkpoint, batch_size=4, limit=6,
+                                 token_budget=0)
+    assert stats["ok"] == 6
+
+    second = StubGenerate()
+    stats = scraper.run_pipeline(df, second, checkpoint, batch_size=4, token_budget=0)
+    assert stats["ok"] == 4
+    assert sorted(r for call in second.calls for r in call) == [6, 7, 8, 9]
+
+    out = scraper.write_output(df, checkpoint, str(tmp_path / "out.csv"))
+    assert all("Python, SQL" in text for text in out["augmented_text"])
+
+
+def test_failed_batch_is_split_until_it_fits(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    generate = StubGenerate(max_rows=2)
+
+    stats = scraper.run_pipeline(make_df(8), generate, checkpoint, batch_size=8,
+                                 token_budget=0)
+
+    assert stats["ok"] == 8 and stats["error"] == 0
+    assert generate.calls[0] == list(range(8))
+    assert max(len(c) for c in generate.calls[1:]) <= 4
+    assert len(scraper.load_checkpoint(checkpoint)) == 8
+
+
+def test_only_the_failing_row_is_an_error_and_retried_on_resume(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    df = make_df(6)
+
+    stats = scraper.run_pipeline(df, StubGenerate(poison={3}), checkpoint, batch_size=6,
+                                 token_budget=0)
+    assert stats["ok"] == 5 and stats["error"] == 1
+    assert 3 not in scraper.load_checkpoint(checkpoint)
+
+    retry = StubGenerate()
+    stats = scraper.run_pipeline(df, retry, checkpoint, batch_size=6, token_budget=0)
+    assert retry.calls == [[3]]
+    assert stats["ok"] == 1
+
+
+def test_short_generate_output_is_treated_as_a_failure(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+
+    def drops_last_row(prompts):
+        texts = [GENERATED for _ in prompts]
+        return texts[:-1] if len(texts) > 1 else texts
+
+    stats = scraper.run_pipeline(make_df(4), drops_last_row, checkpoint, batch_size=4,
+                                 token_budget=0)
+    assert stats["ok"] == 4
+    assert len(scraper.load_checkpoint(checkpoint)) == 4
+
+
+def test_plan_batches_covers_every_row_within_budget():
+    lengths = [50, 900, 120, 130, 880, 60, 55, 400]
+    plan = scraper.plan_batches(lengths, token_budget=2048, max_rows=4, new_tokens=100)
+
+    assert sorted(k for batch in plan for k in batch) == list(range(len(lengths)))
+    for batch in plan:
+        longest = max(lengths[k] for k in batch)
+        assert len(batch) <= 4
+        assert len(batch) == 1 or len(batch) * (longest + 100) <= 2048
@@ -1,35 +1,41 @@
-import pandas as pd
+"""
+Augments the resume dataset with fields extracted by Mistral.
+
+    python -m utils.scraper --batch-size 8
+    python -m utils.scraper --limit 100        # try it on a few rows
+    python -m utils.scraper --token-budget 0   # fixed batches of --batch-size
+
+Rows are sent to the model in batches of similar prompt length, sized
+to a token budget, and every finished batch is appended to a JSONL
+checkpoint, so an interrupted run picks up where it stopped. The CSV is
+written once, at the end, from the checkpoint.
+"""
+import argparse
+import json
+import os
 import re
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline, BitsAndBytesConfig
-from tqdm import tqdm
-import torch
 import time
 
+import pandas as pd
+
 DATA_PATH = "data/UpdatedResumeDataSet.csv"
 OUTPUT_PATH = "cv_augmented_dataset.csv"
+CHECKPOINT_PATH = "cv_augmented_dataset.jsonl"
 MODEL_NAME = "mistralai/Mistral-7B-Instruct-v0.2"
 MAX_NEW_TOKENS = 300
+BATCH_SIZE = 8
 
-device = "cuda" if torch.cuda.is_available() else "cpu"
-print(f"[INFO] Using device: {device}")
-
-bnb_config = BitsAndBytesConfig(
-    load_in_4bit=True,
-    bnb_4bit_use_double_quant=True,
-    bnb_4bit_quant_type="nf4",
-    bnb_4bit_compute_dtype=torch.bfloat16
-)
-
-print(f"[INFO] Loading model: {MODEL_NAME} in 4-bit")
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForCausalLM.from_pretrained(
-    MODEL_NAME,
-    device_map="auto",
-    quantization_config=bnb_config,
-    torch_dtype=torch.bfloat16
-)
-
-SYSTEM_PROMPT = """You are an expert at extracting structured information from resumes. 
+# Dynamic batching: a batch costs about rows * (longest prompt + new
+# tokens) of activations/KV cache, so that product is what is capped.
+TOKEN_BUDGET = 16384
+MAX_BATCH_ROWS = 32
+# a prompt joins a batch only if padding it to the batch's longest
+# prompt adds at most this fraction of that length
+MAX_PADDING = 0.2
+# rows that are tokenized, sorted by length and scheduled together
+SCHEDULE_WINDOW = 512
+
+SYSTEM_PROMPT = """You are an expert at extracting structured information from resumes.
 Extract ONLY the following fields from the resume text. Format your response exactly as shown below:
 
 Education: [list education details]
@@ -40,6 +46,10 @@ Tools: [list tools and software]
 
 If a field is not found, write "Not specified". Be concise and only include relevant information."""
 
+phone_regex = re.compile(r"\+?\d[\d\s-]{7,}\d")
+email_regex = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+
+
 def create_prompt(resume_text):
     return f"""<s>[INST] {SYSTEM_PROMPT}
 
@@ -49,34 +59,115 @@ Resume Text:
 Extracted Information:
 [/INST]"""
 
-generator = pipeline(
-    "text-generation", 
-    model=model, 
-    tokenizer=tokenizer, 
-    max_new_tokens=MAX_NEW_TOKENS,
-    temperature=0.1,
-    do_sample=True
-)
 
-if tokenizer.pad_token is None:
-    tokenizer.pad_token = tokenizer.eos_token
-generator.model.config.pad_token_id = generator.model.config.eos_token_id
+def load_generator(model_name: str = MODEL_NAME):
+    """
+    Loads the 4-bit model and returns (pipeline, tokenizer).
+    """
+    import torch
+    from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline, BitsAndBytesConfig
 
-df = pd.read_csv(DATA_PATH)
-if "augmented_text" not in df.columns:
-    df["augmented_text"] = ""
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print(f"[INFO] Using device: {device}")
+
+    bnb_config = BitsAndBytesConfig(
+        load_in_4bit=True,
+        bnb_4bit_use_double_quant=True,
+        bnb_4bit_quant_type="nf4",
+        bnb_4bit_compute_dtype=torch.bfloat16
+    )
+
+    print(f"[INFO] Loading model: {model_name} in 4-bit")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    # decoder-only models must be left-padded for batched generation,
+    # otherwise shorter prompts continue after their pad tokens
+    tokenizer.padding_side = "left"
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+
+    model = AutoModelForCausalLM.from_pretrained(
+        model_name,
+        device_map="auto",
+        quantization_config=bnb_config,
+        torch_dtype=torch.bfloat16
+    )
+    model.config.pad_token_id = model.config.eos_token_id
+
+    generator = pipeline(
+        "text-generation",
+        model=model,
+        tokenizer=tokenizer,
+        max_new_tokens=MAX_NEW_TOKENS,
+        temperature=0.1,
+        do_sample=True
+    )
+    return generator, tokenizer
+
+
+def make_generate_fn(generator, tokenizer, max_new_tokens: int = MAX_NEW_TOKENS):
+    """
+    Wraps the HF pipeline as generate(prompts) -> list of texts, running
+    the whole list as one padded batch.
+    """
+    def generate(prompts: list[str]) -> list[str]:
+        outputs = generator(
+            prompts,
+            batch_size=len(prompts),
+            max_new_tokens=max_new_tokens,
+            do_sample=True,
+            temperature=0.1,
+            pad_token_id=tokenizer.eos_token_id,
+            return_full_text=False,
+        )
+        return [out[0]["generated_text"] for out in outputs]
+
+    return generate
+
+
+def make_token_counter(tokenizer):
+    def count_tokens(prompts: list[str]) -> list[int]:
+        return [len(ids) for ids in tokenizer(prompts)["input_ids"]]
+
+    return count_tokens
+
+
+def plan_batches(lengths: list[int], token_budget: int = TOKEN_BUDGET,
+                 max_rows: int = MAX_BATCH_ROWS, new_tokens: int = MAX_NEW_TOKENS,
+                 max_padding: float = MAX_PADDING) -> list[list[int]]:
+    """
+    Buckets prompt indices by length into batches: sorted longest first,
+    a batch grows while rows * (its longest prompt + new tokens) stays
+    within `token_budget` and the next prompt is within `max_padding`
+    of the longest. Short prompts end up in wide batches, long ones in
+    narrow batches, and little compute goes to padding. A prompt over
+    the budget on its own still gets a batch of one.
+    """
+    order = sorted(range(len(lengths)), key=lambda k: lengths[k], reverse=True)
+    batches = []
+    current = []
+    for k in order:
+        if current:
+            # sorted descending, so the batch's first prompt is its longest
+            longest = lengths[current[0]]
+            if ((len(current) + 1) * (longest + new_tokens) > token_budget
+                    or len(current) >= max_rows
+                    or lengths[k] < longest * (1 - max_padding)):
+                batches.append(current)
+                current = []
+        current.append(k)
+    if current:
+        batches.append(current)
+    return batches
 
-phone_regex = re.compile(r"\+?\d[\d\s-]{7,}\d")
-email_regex = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
 
 def clean_extraction_result(text):
     """Clean the model output to remove prompt repetition"""
 
     if "Extracted Information:" in text:
         text = text.split("Extracted Information:")[-1].strip()
-    
+
     text = text.replace("[INST]", "").replace("[/INST]", "").strip()
-    
+
     return text
 
 def parse_extracted_text(text):
@@ -84,18 +175,18 @@ def parse_extracted_text(text):
     lines = text.split('\n')
     parsed = {
         'Education': '',
-        'Experience': '', 
+        'Experience': '',
         'Skills': '',
         'Projects': '',
         'Tools': ''
     }
-    
+
     current_section = None
     for line in lines:
         line = line.strip()
         if not line:
             continue
-            
+
         for section in parsed.keys():
             if line.lower().startswith(section.lower()):
                 current_section = section
@@ -108,63 +199,207 @@ def parse_extracted_text(text):
                 parsed[current_section] += " " + line
             elif current_section:
                 parsed[current_section] = line
-                
-    return parsed
 
-start_time = time.time()
-success = 0
-total = len(df)
+    return parsed
 
-for i, row in tqdm(df.iterrows(), total=total, desc="Processing"):
-    resume_text = str(row.get("Resume", "")).strip()
-    if not resume_text:
-        continue
 
+def build_structured_output(resume_text: str, generated: str) -> str:
     phone = phone_regex.findall(resume_text)
     email = email_regex.findall(resume_text)
+    parsed_info = parse_extracted_text(clean_extraction_result(generated))
 
-    prompt = create_prompt(resume_text)
+    structured_output = f"Phone: {', '.join(phone) if phone else 'Not specified'}\n"
+    structured_output += f"Email: {', '.join(email) if email else 'Not specified'}\n"
+
+    for section, content in parsed_info.items():
+        if content:
+            structured_output += f"{section}: {content}\n"
+        else:
+            structured_output += f"{section}: Not specified\n"
 
+    return structured_output.strip()
+
+
+# ---------- checkpoint ----------
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Row index -> augmented text for every row finished so far. Error
+    records are not counted, so those rows are retried.
+    """
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line after a crash
+            if record.get("status") in ("ok", "empty"):
+                done[record["row"]] = record.get("augmented_text", "")
+    return done
+
+
+def append_checkpoint(f, records: list[dict]):
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    # one fsync per batch, not per row
+    f.flush()
+    os.fsync(f.fileno())
+
+
+# ---------- pipeline ----------
+
+def _generate_batch(generate, batch):
+    """
+    Runs one batch; on failure (e.g. out of memory) splits it in half
+    until the offending row is isolated. Yields (row, text or error).
+    """
     try:
-        result = generator(
-            prompt, 
-            max_new_tokens=MAX_NEW_TOKENS, 
-            do_sample=True,
-            temperature=0.1,
-            pad_token_id=tokenizer.eos_token_id
-        )[0]["generated_text"]
-        
-        clean_result = clean_extraction_result(result)
-        
-        parsed_info = parse_extracted_text(clean_result)
-        
-        structured_output = f"Phone: {', '.join(phone) if phone else 'Not specified'}\n"
-        structured_output += f"Email: {', '.join(email) if email else 'Not specified'}\n"
-        
-        for section, content in parsed_info.items():
-            if content:
-                structured_output += f"{section}: {content}\n"
-            else:
-                structured_output += f"{section}: Not specified\n"
-        
-        df.at[i, "augmented_text"] = structured_output.strip()
-        success += 1
+        texts = list(generate([create_prompt(text) for _, text in batch]))
+        # a short result would silently drop rows from the checkpoint
+        if len(texts) != len(batch):
+            raise RuntimeError(f"generate returned {len(texts)} outputs for {len(batch)} prompts")
+    except Exception as e:
+        _free_gpu_memory()
+        if len(batch) == 1:
+            yield batch[0][0], None, f"{type(e).__name__}: {e}"
+            return
+        mid = len(batch) // 2
+        yield from _generate_batch(generate, batch[:mid])
+        yield from _generate_batch(generate, batch[mid:])
+        return
+    yield from ((row, text, None) for (row, _), text in zip(batch, texts))
+
 
+def _free_gpu_memory():
+    try:
+        import torch
+    except ImportError:
+        return
+    if torch.cuda.is_available():
         torch.cuda.empty_cache()
-        torch.cuda.ipc_collect()
 
-        if (i + 1) % 3 == 0:
-            df.to_csv(OUTPUT_PATH, index=False)
 
-    except RuntimeError as e:
-        print(f"Error at index {i}: {e}")
-        torch.cuda.empty_cache()
-        continue
-    except Exception as e:
-        print(f"Unexpected error at index {i}: {e}")
-        continue
+def run_pipeline(df: pd.DataFrame, generate, checkpoint_path: str = CHECKPOINT_PATH,
+                 batch_size: int = BATCH_SIZE, limit: int | None = None,
+                 count_tokens=None, token_budget: int | None = TOKEN_BUDGET,
+                 new_tokens: int = MAX_NEW_TOKENS) -> dict:
+    """
+    Streams the not-yet-done rows of `df` through `generate(prompts) ->
+    texts` and appends results to the JSONL checkpoint, keyed by row.
+    `generate` is the model (see make_generate_fn) or any stand-in with
+    the same signature.
+
+    With `count_tokens` and a `token_budget`, each window of rows is
+    scheduled with plan_batches; otherwise rows go in order, in batches
+    of `batch_size`.
+    """
+    done = load_checkpoint(checkpoint_path)
+    todo = [i for i in range(len(df)) if i not in done]
+    if limit is not None:
+        todo = todo[:limit]
+    print(f"[INFO] {len(done)} rows already done, {len(todo)} to process")
+
+    dynamic = count_tokens is not None and bool(token_budget)
+    window = SCHEDULE_WINDOW if dynamic else batch_size
+    stats = {"ok": 0, "empty": 0, "error": 0, "batches": 0}
+    start = time.perf_counter()
+    finished = 0
+    resumes = df["Resume"] if "Resume" in df.columns else pd.Series([""] * len(df))
+
+    with open(checkpoint_path, "a", encoding="utf-8") as f:
+        for w in range(0, len(todo), window):
+            empty = []
+            work = []
+            for i in todo[w:w + window]:
+                text = str(resumes.iloc[i]).strip()
+                if not text or text == "nan":
+                    empty.append({"row": i, "status": "empty", "augmented_text": ""})
+                else:
+                    work.append((i, text))
+
+            if dynamic and work:
+                lengths = count_tokens([create_prompt(text) for _, text in work])
+                plan = plan_batches(lengths, token_budget, MAX_BATCH_ROWS, new_tokens)
+                batches = [[work[k] for k in batch] for batch in plan]
+            else:
+                batches = [work[k:k + batch_size] for k in range(0, len(work), batch_size)]
+
+            if empty:
+                append_checkpoint(f, empty)
+                stats["empty"] += len(empty)
+                finished += len(empty)
+
+            for batch in batches:
+                texts = dict(batch)
+                records = []
+                # results come back per row id, whatever order the batch ran in
+                for i, generated, error in _generate_batch(generate, batch):
+                    if error is None:
+                        records.append({
+                            "row": i, "status": "ok",
+                            "augmented_text": build_structured_output(texts[i], generated),
+                        })
+                    else:
+                        print(f"Error at index {i}: {error}")
+                        records.append({"row": i, "status": "error", "error": error})
+
+                append_checkpoint(f, records)
+                for r in records:
+                    stats[r["status"]] += 1
+                stats["batches"] += 1
+
+                finished += len(batch)
+                elapsed = time.perf_counter() - start
+                rate = finished / elapsed if elapsed else 0.0
+                eta = (len(todo) - finished) / rate if rate else 0.0
+                print(f"[INFO] {finished}/{len(todo)} rows | batch of {len(batch)} | "
+                      f"{rate:.2f} rows/s | ETA {eta / 60:.1f} min")
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = round(elapsed, 2)
+    stats["rows_per_sec"] = round(len(todo) / elapsed, 3) if elapsed else 0.0
+    return stats
+
+
+def write_output(df: pd.DataFrame, checkpoint_path: str = CHECKPOINT_PATH,
+                 output_path: str = OUTPUT_PATH):
+    """
+    Joins the checkpoint onto the dataset and writes the CSV once.
+    """
+    done = load_checkpoint(checkpoint_path)
+    df = df.copy()
+    df["augmented_text"] = [done.get(i, "") for i in range(len(df))]
+    df.to_csv(output_path, index=False)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="rows per batch when --token-budget is 0")
+    parser.add_argument("--token-budget", type=int, default=TOKEN_BUDGET,
+                        help="max rows * (longest prompt + new tokens) per batch; 0 = fixed batches")
+    parser.add_argument("--limit", type=int, help="process at most this many new rows")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data)
+    generator, tokenizer = load_generator(args.model)
+    stats = run_pipeline(df, make_generate_fn(generator, tokenizer),
+                         args.checkpoint, args.batch_size, args.limit,
+                         count_tokens=make_token_counter(tokenizer),
+                         token_budget=args.token_budget)
+    write_output(df, args.checkpoint, args.output)
+
+    print(f"Done. Successful extractions: {stats['ok']}/{stats['ok'] + stats['error']}")
+    print(f"Time taken: {stats['seconds']:.2f} seconds ({stats['rows_per_sec']} rows/s)")
+
 
-df.to_csv(OUTPUT_PATH, index=False)
-end_time = time.time()
-print(f"Done. Successful extractions: {success}/{total}")
-print(f"Time taken: {end_time - start_time:.2f} seconds")
\ No newline at end of file
+if __name__ == "__main__":
+    main()